@@ -55,6 +55,8 @@ class DiscordSendDispatcher:
         on_forward_callback: Optional[Callable[[dict], Any]] = None,
         max_in_flight: int = 5,
         per_webhook_queue_size: int = 500,
+        log_batch_size: int = 50,
+        log_flush_interval: float = 0.25,
     ):
         self.sender = sender
         self.db = db
@@ -64,6 +66,12 @@ class DiscordSendDispatcher:
         self._queues: dict[str, asyncio.Queue[DiscordJob]] = {}
         self._tasks: dict[str, asyncio.Task] = {}
         self._db_lock = asyncio.Lock()
+        # Forward log rows are written in batches: when log_batch_size rows are
+        # pending or log_flush_interval seconds after the first one, whichever is first.
+        self._log_batch_size = log_batch_size
+        self._log_flush_interval = log_flush_interval
+        self._log_rows: list[dict] = []
+        self._log_flush_task: Optional[asyncio.Task] = None
         self._closed = False
 
     def make_media_ref(self, path: str, fanout: int) -> _MediaRef:
@@ -91,6 +99,11 @@ class DiscordSendDispatcher:
         await asyncio.gather(*self._tasks.values(), return_exceptions=True)
         self._tasks.clear()
         self._queues.clear()
+        if self._log_flush_task is not None:
+            self._log_flush_task.cancel()
+            await asyncio.gather(self._log_flush_task, return_exceptions=True)
+            self._log_flush_task = None
+        await self._flush_logs()
 
     async def _worker(self, webhook_url: str) -> None:
         queue = self._queues[webhook_url]
@@ -117,21 +130,26 @@ class DiscordSendDispatcher:
     async def _record_result(
         self, job: DiscordJob, success: bool, error: Optional[str]
     ) -> None:
-        async with self._db_lock:
-            if job.route_mapping_id is not None:
-                self.db.add_forward_log_v2(
-                    route_mapping_id=job.route_mapping_id,
-                    telegram_message_id=job.message_id,
-                    destination_type=job.destination_type,
-                    destination_name=job.destination_name,
-                    original_text=job.original_text[:1000] if job.original_text else None,
-                    transformed_text=job.transformed_text[:1000]
+        if job.route_mapping_id is not None:
+            self._log_rows.append(
+                {
+                    "route_mapping_id": job.route_mapping_id,
+                    "telegram_message_id": job.message_id,
+                    "destination_type": job.destination_type,
+                    "destination_name": job.destination_name,
+                    "original_text": job.original_text[:1000] if job.original_text else None,
+                    "transformed_text": job.transformed_text[:1000]
                     if job.transformed_text
                     else None,
-                    has_media=job.has_media,
-                    status="success" if success else "error",
-                    error_message=error,
-                )
+                    "has_media": job.has_media,
+                    "status": "success" if success else "error",
+                    "error_message": error,
+                }
+            )
+            if len(self._log_rows) >= self._log_batch_size:
+                await self._flush_logs()
+            elif self._log_flush_task is None:
+                self._log_flush_task = asyncio.create_task(self._flush_logs_later())
 
         if self.on_forward_callback:
             event = {
@@ -151,3 +169,17 @@ class DiscordSendDispatcher:
             except Exception:
                 logger.exception("Forward callback failed")
 
+    async def _flush_logs_later(self) -> None:
+        await asyncio.sleep(self._log_flush_interval)
+        self._log_flush_task = None
+        await self._flush_logs()
+
+    async def _flush_logs(self) -> None:
+        async with self._db_lock:
+            rows, self._log_rows = self._log_rows, []
+            if not rows:
+                return
+            try:
+                await asyncio.to_thread(self.db.add_forward_logs_v2_bulk, rows)
+            except Exception:
+                logger.exception("Failed to write %d forward log rows", len(rows))
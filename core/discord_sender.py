@@ -6,6 +6,7 @@ import re
 from pathlib import Path
 from typing import Optional, Any
 from dataclasses import dataclass
+from functools import lru_cache
 from urllib.parse import urlparse
 
 
@@ -45,7 +46,18 @@ class DiscordWebhookSender:
     def _redact(cls, text: str) -> str:
         return cls.redact_webhook_url(text)
 
+    _WEBHOOK_HOSTS = frozenset(
+        {
+            "discord.com",
+            "discordapp.com",
+            "canary.discord.com",
+            "ptb.discord.com",
+        }
+    )
+
+    # Checked before every send and per doctor route; the same few URLs recur.
     @staticmethod
+    @lru_cache(maxsize=256)
     def is_discord_webhook_url(webhook_url: str) -> bool:
         try:
             parsed = urlparse(webhook_url)
@@ -56,12 +68,7 @@ class DiscordWebhookSender:
             return False
 
         host = (parsed.hostname or "").lower()
-        if host not in {
-            "discord.com",
-            "discordapp.com",
-            "canary.discord.com",
-            "ptb.discord.com",
-        }:
+        if host not in DiscordWebhookSender._WEBHOOK_HOSTS:
             return False
 
         if not parsed.path.startswith("/api/webhooks/"):
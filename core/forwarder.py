@@ -808,6 +808,7 @@ class Forwarder:
 
         transformed = self._neutralize_mass_mentions(transform_result.transformed_text)
 
+        telegram_log_rows: list[dict] = []
         for route_info in telegram_routes:
             destination_chat_id = route_info.get("telegram_chat_id")
             if destination_chat_id is None:
@@ -866,8 +867,12 @@ class Forwarder:
                 has_media=media_path is not None,
                 success=success,
                 error=error,
+                log_rows=telegram_log_rows,
             )
 
+        if telegram_log_rows:
+            await asyncio.to_thread(self.db.add_forward_logs_v2_bulk, telegram_log_rows)
+
         attachment_name = Path(media_path).name if media_path else None
         for route_info in discord_routes:
             channel_name = route_info.get("channel_name") or str(chat_id)
@@ -1116,22 +1121,28 @@ class Forwarder:
         has_media: bool,
         success: bool,
         error: Optional[str],
+        log_rows: list[dict],
     ) -> None:
         route_mapping_id = route_info.get("route_mapping_id")
 
         if route_mapping_id is not None:
-            self.db.add_forward_log_v2(
-                route_mapping_id=route_mapping_id,
-                telegram_message_id=message_id,
-                destination_type=route_info.get(
-                    "destination_type", DestinationType.TELEGRAM_CHAT.value
-                ),
-                destination_name=route_info.get("destination_name"),
-                original_text=original_text[:1000] if original_text else None,
-                transformed_text=transformed_text[:1000] if transformed_text else None,
-                has_media=has_media,
-                status="success" if success else "error",
-                error_message=error,
+            # Collected by the caller and written once per message fan-out.
+            log_rows.append(
+                {
+                    "route_mapping_id": route_mapping_id,
+                    "telegram_message_id": message_id,
+                    "destination_type": route_info.get(
+                        "destination_type", DestinationType.TELEGRAM_CHAT.value
+                    ),
+                    "destination_name": route_info.get("destination_name"),
+                    "original_text": original_text[:1000] if original_text else None,
+                    "transformed_text": transformed_text[:1000]
+                    if transformed_text
+                    else None,
+                    "has_media": has_media,
+                    "status": "success" if success else "error",
+                    "error_message": error,
+                }
             )
 
         if self._on_forward_callback:
@@ -1194,8 +1205,11 @@ class Forwarder:
             await self._dispatcher.close()
             self._dispatcher = None
         await self.discord.close()
+        self.db.remove_session()
 
     def reload_mappings(self):
+        # Explicit reloads must also see edits made by other processes.
+        self.db.clear_read_cache()
         self._load_mappings()
         logger.info("Reloaded channel mappings")
 
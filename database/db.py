@@ -1,8 +1,18 @@
-from typing import Optional
-from sqlalchemy import func
-from sqlalchemy.orm import Session, sessionmaker
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import count
+from typing import Callable, Iterator, Optional, TypeVar
+from sqlalchemy import event, exists, func, select, tuple_
+from sqlalchemy.orm import (
+    Session,
+    raiseload,
+    scoped_session,
+    selectinload,
+    sessionmaker,
+)
 from .models import (
     init_db,
+    forward_logs_v2_stamped_by_db,
     _sync_v2_from_v1,
     TelegramChannel,
     SourceGroup,
@@ -22,69 +32,182 @@ from .models import (
 )
 
 
+_T = TypeVar("_T")
+
+
+@dataclass(frozen=True)
+class MappingRow:
+    id: int
+    channel_id: int
+    webhook_id: int
+    group_id: Optional[int]
+
+
+@dataclass(frozen=True)
+class ChannelMappingRow:
+    id: int
+    channel_id: int
+    webhook_id: int
+    is_active: bool
+
+
+@dataclass(frozen=True)
+class DoctorSnapshot:
+    channels: list[TelegramChannel]
+    destination_rows: list[dict]
+    route_rows: list[dict]
+    session_string: Optional[str]
+
+
 class Database:
     def __init__(self, database_path: Optional[str] = None):
         self.engine = init_db(database_path=database_path)
-        self._session_factory = sessionmaker(
-            bind=self.engine, expire_on_commit=False
+        # One reusable session per thread instead of a fresh Session per call.
+        self._session_factory = scoped_session(
+            sessionmaker(bind=self.engine, expire_on_commit=False)
         )
+        # init_db() skips the v1 -> v2 sync when schema_version is current, so
+        # v1 rows written by an older build or another process may still be
+        # unmirrored: the first reader syncs.
+        self._v2_dirty = True
+        # Forward-log tables from older builds have no forwarded_at default.
+        self._stamp_forward_logs_v2 = not forward_logs_v2_stamped_by_db(self.engine)
+        # Read-mostly lists the TUI redraws from, tagged with the commit
+        # counter they were loaded under; any commit on the engine stales them.
+        self._commit_counter = count(1)
+        self._data_version = 0
+        self._read_cache: dict[tuple, tuple[int, list]] = {}
+        event.listen(self.engine, "commit", self._on_commit)
 
     def _get_session(self) -> Session:
         return self._session_factory()
 
+    @staticmethod
+    def _has_changes(session: Session) -> bool:
+        # session.dirty also lists objects re-assigned their current value.
+        return any(session.is_modified(obj) for obj in session.dirty)
+
+    def _on_commit(self, _conn) -> None:
+        # next() on itertools.count is atomic, so concurrent writers never
+        # collapse two commits into one version.
+        self._data_version = next(self._commit_counter)
+
+    def clear_read_cache(self) -> None:
+        """Drop cached lists, e.g. after another process may have written."""
+        self._read_cache.clear()
+
+    def _cached_rows(self, key: tuple, load: Callable[[], list[_T]]) -> list[_T]:
+        version = self._data_version
+        hit = self._read_cache.get(key)
+        if hit is not None and hit[0] == version:
+            return list(hit[1])
+        rows = load()
+        self._read_cache[key] = (version, rows)
+        return list(rows)
+
+    def remove_session(self) -> None:
+        """Discard the calling thread's session (call at task/thread teardown)."""
+        self._session_factory.remove()
+
     def _sync_v2_compat(self) -> None:
+        # v1 writers flag the mirror dirty; readers only resync when needed.
+        if not self._v2_dirty:
+            return
         _sync_v2_from_v1(self.engine)
+        self._v2_dirty = False
 
     def get_legacy_migration_report(self) -> dict[str, object]:
         """Return a compatibility report for legacy v1 -> v2 mirrored rows."""
+        # Verification must see the mirror as the backfill leaves it, including
+        # v1 writes made outside this process since startup.
+        self._v2_dirty = True
         self._sync_v2_compat()
         with self._get_session() as session:
-            webhook_ids = {
-                int(row[0]) for row in session.query(DiscordWebhook.id).all()
-            }
-            mirrored_webhook_ids = {
-                int(row[0])
-                for row in session.query(DestinationDiscord.legacy_webhook_id)
-                .filter(DestinationDiscord.legacy_webhook_id.isnot(None))
-                .all()
-            }
-
-            mapping_ids = {
-                int(row[0]) for row in session.query(ChannelMapping.id).all()
-            }
-            mirrored_mapping_ids = {
-                int(row[0])
-                for row in session.query(RouteMapping.legacy_channel_mapping_id)
-                .filter(RouteMapping.legacy_channel_mapping_id.isnot(None))
-                .all()
-            }
-
-            transform_mapping_ids = {
-                int(row[0])
-                for row in session.query(TransformRule.mapping_id)
-                .filter(TransformRule.mapping_id.isnot(None))
-                .all()
-            }
-
-            missing_webhook_ids = sorted(webhook_ids - mirrored_webhook_ids)
-            orphaned_webhook_mirror_ids = sorted(mirrored_webhook_ids - webhook_ids)
-            missing_mapping_ids = sorted(mapping_ids - mirrored_mapping_ids)
-            orphaned_mapping_mirror_ids = sorted(mirrored_mapping_ids - mapping_ids)
-            unmatched_transform_mapping_ids = sorted(
-                transform_mapping_ids - mapping_ids
+            missing_webhook_ids = (
+                session.query(DiscordWebhook.id)
+                .outerjoin(
+                    DestinationDiscord,
+                    DestinationDiscord.legacy_webhook_id == DiscordWebhook.id,
+                )
+                .filter(DestinationDiscord.destination_id.is_(None))
+                .order_by(DiscordWebhook.id)
+            )
+            orphaned_webhook_mirror_ids = (
+                session.query(DestinationDiscord.legacy_webhook_id)
+                .outerjoin(
+                    DiscordWebhook,
+                    DiscordWebhook.id == DestinationDiscord.legacy_webhook_id,
+                )
+                .filter(
+                    DestinationDiscord.legacy_webhook_id.isnot(None),
+                    DiscordWebhook.id.is_(None),
+                )
+                .order_by(DestinationDiscord.legacy_webhook_id)
+            )
+            missing_mapping_ids = (
+                session.query(ChannelMapping.id)
+                .outerjoin(
+                    RouteMapping,
+                    RouteMapping.legacy_channel_mapping_id == ChannelMapping.id,
+                )
+                .filter(RouteMapping.id.is_(None))
+                .order_by(ChannelMapping.id)
+            )
+            orphaned_mapping_mirror_ids = (
+                session.query(RouteMapping.legacy_channel_mapping_id)
+                .outerjoin(
+                    ChannelMapping,
+                    ChannelMapping.id == RouteMapping.legacy_channel_mapping_id,
+                )
+                .filter(
+                    RouteMapping.legacy_channel_mapping_id.isnot(None),
+                    ChannelMapping.id.is_(None),
+                )
+                .order_by(RouteMapping.legacy_channel_mapping_id)
+            )
+            unmatched_transform_mapping_ids = (
+                session.query(TransformRule.mapping_id)
+                .outerjoin(ChannelMapping, ChannelMapping.id == TransformRule.mapping_id)
+                .filter(
+                    TransformRule.mapping_id.isnot(None),
+                    ChannelMapping.id.is_(None),
+                )
+                .distinct()
+                .order_by(TransformRule.mapping_id)
             )
 
             return {
-                "legacy_webhooks_total": len(webhook_ids),
-                "legacy_mappings_total": len(mapping_ids),
-                "legacy_transform_rules_linked_total": len(transform_mapping_ids),
-                "mirrored_destinations_total": len(mirrored_webhook_ids),
-                "mirrored_routes_total": len(mirrored_mapping_ids),
-                "missing_webhook_ids": missing_webhook_ids,
-                "orphaned_webhook_mirror_ids": orphaned_webhook_mirror_ids,
-                "missing_mapping_ids": missing_mapping_ids,
-                "orphaned_mapping_mirror_ids": orphaned_mapping_mirror_ids,
-                "unmatched_transform_mapping_ids": unmatched_transform_mapping_ids,
+                "legacy_webhooks_total": session.query(
+                    func.count(DiscordWebhook.id)
+                ).scalar()
+                or 0,
+                "legacy_mappings_total": session.query(
+                    func.count(ChannelMapping.id)
+                ).scalar()
+                or 0,
+                "legacy_transform_rules_linked_total": session.query(
+                    func.count(func.distinct(TransformRule.mapping_id))
+                ).scalar()
+                or 0,
+                "mirrored_destinations_total": session.query(
+                    func.count(DestinationDiscord.legacy_webhook_id)
+                ).scalar()
+                or 0,
+                "mirrored_routes_total": session.query(
+                    func.count(RouteMapping.legacy_channel_mapping_id)
+                ).scalar()
+                or 0,
+                "missing_webhook_ids": [int(r[0]) for r in missing_webhook_ids],
+                "orphaned_webhook_mirror_ids": [
+                    int(r[0]) for r in orphaned_webhook_mirror_ids
+                ],
+                "missing_mapping_ids": [int(r[0]) for r in missing_mapping_ids],
+                "orphaned_mapping_mirror_ids": [
+                    int(r[0]) for r in orphaned_mapping_mirror_ids
+                ],
+                "unmatched_transform_mapping_ids": [
+                    int(r[0]) for r in unmatched_transform_mapping_ids
+                ],
             }
 
     def add_telegram_channel(
@@ -108,7 +231,7 @@ class Database:
                 if source_group is not None:
                     existing.source_group = source_group_clean
                 session.commit()
-                session.refresh(existing)
+                session.expunge(existing)
                 channel_db_id = existing.id
             else:
                 channel = TelegramChannel(
@@ -119,30 +242,35 @@ class Database:
                 )
                 session.add(channel)
                 session.commit()
-                session.refresh(channel)
+                session.expunge(channel)
                 channel_db_id = channel.id
 
         if source_group is not None:
             self.set_telegram_channel_source_group(channel_db_id, source_group_clean)
         with self._get_session() as session:
-            return session.query(TelegramChannel).filter_by(id=channel_db_id).first()
+            return session.get(TelegramChannel, channel_db_id)
 
     def get_telegram_channels(self, active_only: bool = False) -> list[TelegramChannel]:
+        rows = self._cached_rows(("channels",), self._load_telegram_channels)
+        if active_only:
+            return [c for c in rows if c.is_active]
+        return rows
+
+    def _load_telegram_channels(self) -> list[TelegramChannel]:
         with self._get_session() as session:
-            query = session.query(TelegramChannel)
-            if active_only:
-                query = query.filter_by(is_active=True)
-            return query.all()
+            rows = session.query(TelegramChannel).all()
+            session.expunge_all()
+            return rows
 
     def get_telegram_channel(self, channel_id: int) -> Optional[TelegramChannel]:
         with self._get_session() as session:
-            return (
-                session.query(TelegramChannel).filter_by(channel_id=channel_id).first()
-            )
+            return session.execute(
+                select(TelegramChannel).where(TelegramChannel.channel_id == channel_id)
+            ).scalar_one_or_none()
 
     def delete_telegram_channel(self, db_id: int) -> bool:
         with self._get_session() as session:
-            channel = session.query(TelegramChannel).filter_by(id=db_id).first()
+            channel = session.get(TelegramChannel, db_id)
             if channel:
                 session.delete(channel)
                 session.commit()
@@ -151,10 +279,11 @@ class Database:
 
     def toggle_telegram_channel(self, db_id: int, is_active: bool) -> bool:
         with self._get_session() as session:
-            channel = session.query(TelegramChannel).filter_by(id=db_id).first()
+            channel = session.get(TelegramChannel, db_id)
             if channel:
-                channel.is_active = is_active
-                session.commit()
+                if channel.is_active != is_active:
+                    channel.is_active = is_active
+                    session.commit()
                 return True
             return False
 
@@ -166,7 +295,7 @@ class Database:
         source_group: Optional[str] = None,
     ) -> bool:
         with self._get_session() as session:
-            channel = session.query(TelegramChannel).filter_by(id=db_id).first()
+            channel = session.get(TelegramChannel, db_id)
             if not channel:
                 return False
             if name is not None:
@@ -175,7 +304,8 @@ class Database:
                 channel.username = username
             if source_group is not None:
                 channel.source_group = (source_group or "").strip() or None
-            session.commit()
+            if self._has_changes(session):
+                session.commit()
         if source_group is not None:
             return self.set_telegram_channel_source_group(db_id, source_group)
         return True
@@ -226,7 +356,7 @@ class Database:
     ) -> bool:
         clean_names = self._clean_source_group_names(source_groups)
         with self._get_session() as session:
-            channel = session.query(TelegramChannel).filter_by(id=db_id).first()
+            channel = session.get(TelegramChannel, db_id)
             if not channel:
                 return False
 
@@ -252,7 +382,7 @@ class Database:
             )
 
             for membership in memberships:
-                group = session.query(SourceGroup).filter_by(id=membership.source_group_id).first()
+                group = session.get(SourceGroup, membership.source_group_id)
                 key = (group.name or "").strip().lower() if group else ""
                 if key not in desired_group_ids:
                     session.delete(membership)
@@ -317,12 +447,9 @@ class Database:
         if not clean:
             return False
         with self._get_session() as session:
-            existing = (
-                session.query(SourceGroup)
-                .filter(func.lower(SourceGroup.name) == clean.lower())
-                .first()
-            )
-            if existing:
+            if session.scalar(
+                select(exists().where(func.lower(SourceGroup.name) == clean.lower()))
+            ):
                 return False
             session.add(SourceGroup(name=clean))
             session.commit()
@@ -335,11 +462,6 @@ class Database:
             return False
 
         with self._get_session() as session:
-            duplicate = (
-                session.query(SourceGroup)
-                .filter(func.lower(SourceGroup.name) == new_clean.lower())
-                .first()
-            )
             group = (
                 session.query(SourceGroup)
                 .filter(func.lower(SourceGroup.name) == old_clean.lower())
@@ -347,7 +469,14 @@ class Database:
             )
             if group is None:
                 return False
-            if duplicate and duplicate.id != group.id:
+            if session.scalar(
+                select(
+                    exists().where(
+                        func.lower(SourceGroup.name) == new_clean.lower(),
+                        SourceGroup.id != group.id,
+                    )
+                )
+            ):
                 return False
             group.name = new_clean
             session.commit()
@@ -411,7 +540,8 @@ class Database:
             webhook = DiscordWebhook(name=name, url=url)
             session.add(webhook)
             session.commit()
-            session.refresh(webhook)
+            session.expunge(webhook)
+            self._v2_dirty = True
             self._sync_v2_compat()
             return webhook
 
@@ -420,7 +550,9 @@ class Database:
             query = session.query(DiscordWebhook)
             if active_only:
                 query = query.filter_by(is_active=True)
-            return query.all()
+            rows = query.all()
+            session.expunge_all()
+            return rows
 
     def delete_discord_webhook(self, db_id: int) -> bool:
         with self._get_session() as session:
@@ -430,28 +562,29 @@ class Database:
                 .filter_by(legacy_webhook_id=db_id)
                 .all()
             ]
-            webhook = session.query(DiscordWebhook).filter_by(id=db_id).first()
+            webhook = session.get(DiscordWebhook, db_id)
             if webhook:
                 session.delete(webhook)
                 session.commit()
-                with self._get_session() as cleanup_session:
-                    for destination_id in mirrored_destination_ids:
-                        destination = cleanup_session.query(Destination).filter_by(
-                            id=destination_id
-                        ).first()
-                        if destination:
-                            cleanup_session.delete(destination)
-                    cleanup_session.commit()
+                for destination_id in mirrored_destination_ids:
+                    destination = session.get(Destination, destination_id)
+                    if destination:
+                        session.delete(destination)
+                session.commit()
+                self._v2_dirty = True
                 self._sync_v2_compat()
                 return True
             return False
 
     def toggle_discord_webhook(self, db_id: int, is_active: bool) -> bool:
         with self._get_session() as session:
-            webhook = session.query(DiscordWebhook).filter_by(id=db_id).first()
+            webhook = session.get(DiscordWebhook, db_id)
             if webhook:
+                if webhook.is_active == is_active:
+                    return True
                 webhook.is_active = is_active
                 session.commit()
+                self._v2_dirty = True
                 self._sync_v2_compat()
                 return True
             return False
@@ -463,14 +596,19 @@ class Database:
         url: Optional[str] = None,
     ) -> bool:
         with self._get_session() as session:
-            webhook = session.query(DiscordWebhook).filter_by(id=db_id).first()
+            webhook = session.get(DiscordWebhook, db_id)
             if not webhook:
                 return False
+            if (name is None or webhook.name == name) and (
+                url is None or webhook.url == url
+            ):
+                return True
             if name is not None:
                 webhook.name = name
             if url is not None:
                 webhook.url = url
             session.commit()
+            self._v2_dirty = True
             self._sync_v2_compat()
             return True
 
@@ -481,19 +619,27 @@ class Database:
             group = ForwardingGroup(name=name, delay_seconds=delay_seconds)
             session.add(group)
             session.commit()
-            session.refresh(group)
+            session.expunge(group)
             return group
 
     def get_forwarding_groups(self, active_only: bool = False) -> list[ForwardingGroup]:
+        return self._cached_rows(
+            ("forwarding_groups", active_only),
+            lambda: self._load_forwarding_groups(active_only),
+        )
+
+    def _load_forwarding_groups(self, active_only: bool) -> list[ForwardingGroup]:
         with self._get_session() as session:
             query = session.query(ForwardingGroup)
             if active_only:
                 query = query.filter_by(is_active=True)
-            return query.all()
+            rows = query.all()
+            session.expunge_all()
+            return rows
 
     def delete_forwarding_group(self, db_id: int) -> bool:
         with self._get_session() as session:
-            group = session.query(ForwardingGroup).filter_by(id=db_id).first()
+            group = session.get(ForwardingGroup, db_id)
             if group:
                 session.delete(group)
                 session.commit()
@@ -521,33 +667,119 @@ class Database:
             )
             session.add(mapping)
             session.commit()
-            session.refresh(mapping)
+            session.expunge(mapping)
+            self._v2_dirty = True
             self._sync_v2_compat()
             return mapping
 
+    def add_channel_mappings_bulk(self, pairs: list[tuple[int, int]]) -> int:
+        """Create (channel_db_id, webhook_db_id) mappings in a single transaction.
+
+        Pairs that already have a mapping (in any group) are skipped. Returns the
+        number of mappings created.
+        """
+        if not pairs:
+            return 0
+        with self._get_session() as session:
+            # Only the candidate rows are probed; both columns are covered by
+            # ix_channel_mappings_webhook_id_channel_id.
+            existing = set(
+                session.execute(
+                    select(ChannelMapping.channel_id, ChannelMapping.webhook_id).where(
+                        ChannelMapping.webhook_id.in_({w for _, w in pairs}),
+                        ChannelMapping.channel_id.in_({c for c, _ in pairs}),
+                    )
+                ).tuples()
+            )
+            new_pairs = [p for p in dict.fromkeys(pairs) if p not in existing]
+            if not new_pairs:
+                return 0
+            session.execute(
+                ChannelMapping.__table__.insert(),
+                [{"channel_id": c, "webhook_id": w} for c, w in new_pairs],
+            )
+            session.commit()
+            self._v2_dirty = True
+            self._sync_v2_compat()
+            return len(new_pairs)
+
     def get_channel_mappings(self, active_only: bool = False) -> list[ChannelMapping]:
         with self._get_session() as session:
             query = session.query(ChannelMapping)
             if active_only:
                 query = query.filter_by(is_active=True)
-            return query.all()
-
-    def get_mappings_for_channel(
-        self, telegram_channel_id: int
-    ) -> list[ChannelMapping]:
+            rows = query.all()
+            session.expunge_all()
+            return rows
+
+    def get_channel_mappings_for_webhook(
+        self, webhook_db_id: int
+    ) -> list[ChannelMappingRow]:
+        """Read-only mapping rows for one webhook, without ORM hydration."""
         with self._get_session() as session:
-            channel = (
-                session.query(TelegramChannel)
-                .filter_by(channel_id=telegram_channel_id)
-                .first()
+            result = session.execute(
+                select(
+                    ChannelMapping.id,
+                    ChannelMapping.channel_id,
+                    ChannelMapping.webhook_id,
+                    ChannelMapping.is_active,
+                )
+                .where(ChannelMapping.webhook_id == webhook_db_id)
+                .order_by(ChannelMapping.id)
             )
-            if not channel:
-                return []
-            return (
-                session.query(ChannelMapping)
-                .filter_by(channel_id=channel.id, is_active=True)
+            return [ChannelMappingRow(*row) for row in result]
+
+    def get_unmapped_channels_for_webhook(
+        self, webhook_db_id: int
+    ) -> list[TelegramChannel]:
+        """Active channels with no mapping (in any group) to the given webhook."""
+        mapped = (
+            select(ChannelMapping.id)
+            .where(
+                ChannelMapping.webhook_id == webhook_db_id,
+                ChannelMapping.channel_id == TelegramChannel.id,
+            )
+            .exists()
+        )
+        with self._get_session() as session:
+            rows = (
+                session.execute(
+                    select(TelegramChannel).where(
+                        TelegramChannel.is_active.is_(True), ~mapped
+                    )
+                )
+                .scalars()
                 .all()
             )
+            session.expunge_all()
+            return rows
+
+    def get_mapping_counts_by_webhook(self) -> dict[int, int]:
+        """Return {webhook_db_id: mapping count}; webhooks without mappings are absent."""
+        with self._get_session() as session:
+            return dict(
+                session.execute(
+                    select(ChannelMapping.webhook_id, func.count(ChannelMapping.id))
+                    .group_by(ChannelMapping.webhook_id)
+                ).all()
+            )
+
+    def get_mappings_for_channel(self, telegram_channel_id: int) -> list[MappingRow]:
+        with self._get_session() as session:
+            result = session.execute(
+                select(
+                    ChannelMapping.id,
+                    ChannelMapping.channel_id,
+                    ChannelMapping.webhook_id,
+                    ChannelMapping.group_id,
+                )
+                .join(TelegramChannel, ChannelMapping.channel_id == TelegramChannel.id)
+                .where(
+                    TelegramChannel.channel_id == telegram_channel_id,
+                    ChannelMapping.is_active.is_(True),
+                )
+            )
+            return [MappingRow(*row) for row in result]
 
     def delete_channel_mapping(self, db_id: int) -> bool:
         with self._get_session() as session:
@@ -557,40 +789,107 @@ class Database:
                 .filter_by(legacy_channel_mapping_id=db_id)
                 .all()
             ]
-            mapping = session.query(ChannelMapping).filter_by(id=db_id).first()
+            mapping = session.get(ChannelMapping, db_id)
             if mapping:
                 session.delete(mapping)
                 session.commit()
-                with self._get_session() as cleanup_session:
-                    if legacy_route_ids:
-                        cleanup_session.query(RouteMapping).filter(
-                            RouteMapping.id.in_(legacy_route_ids)
-                        ).delete(synchronize_session=False)
-                    cleanup_session.commit()
+                if legacy_route_ids:
+                    session.query(RouteMapping).filter(
+                        RouteMapping.id.in_(legacy_route_ids)
+                    ).delete(synchronize_session=False)
+                    session.commit()
+                self._v2_dirty = True
                 self._sync_v2_compat()
                 return True
             return False
 
     def toggle_channel_mapping(self, db_id: int, is_active: bool) -> bool:
         with self._get_session() as session:
-            mapping = session.query(ChannelMapping).filter_by(id=db_id).first()
+            mapping = session.get(ChannelMapping, db_id)
             if mapping:
+                if mapping.is_active == is_active:
+                    return True
                 mapping.is_active = is_active
                 session.commit()
+                self._v2_dirty = True
                 self._sync_v2_compat()
                 return True
             return False
 
     def update_channel_mapping_webhook(self, db_id: int, webhook_db_id: int) -> bool:
         with self._get_session() as session:
-            mapping = session.query(ChannelMapping).filter_by(id=db_id).first()
+            mapping = session.get(ChannelMapping, db_id)
             if not mapping:
                 return False
+            if mapping.webhook_id == webhook_db_id:
+                return True
             mapping.webhook_id = webhook_db_id
             session.commit()
+            self._v2_dirty = True
             self._sync_v2_compat()
             return True
 
+    def set_channel_mappings_active(self, db_ids: list[int], is_active: bool) -> int:
+        """Enable or disable many mappings with one UPDATE; returns rows changed."""
+        if not db_ids:
+            return 0
+        with self._get_session() as session:
+            changed = (
+                session.query(ChannelMapping)
+                .filter(
+                    ChannelMapping.id.in_(db_ids),
+                    ChannelMapping.is_active.is_not(is_active),
+                )
+                .update({ChannelMapping.is_active: is_active}, synchronize_session=False)
+            )
+            session.commit()
+        if changed:
+            self._v2_dirty = True
+            self._sync_v2_compat()
+        return changed
+
+    def delete_channel_mappings(self, db_ids: list[int]) -> int:
+        """Delete many mappings (and their mirrored routes); returns rows deleted."""
+        if not db_ids:
+            return 0
+        with self._get_session() as session:
+            # Mirrored routes first: deleting the mapping nulls their link to it.
+            session.query(RouteMapping).filter(
+                RouteMapping.legacy_channel_mapping_id.in_(db_ids)
+            ).delete(synchronize_session=False)
+            deleted = (
+                session.query(ChannelMapping)
+                .filter(ChannelMapping.id.in_(db_ids))
+                .delete(synchronize_session=False)
+            )
+            session.commit()
+        if deleted:
+            self._v2_dirty = True
+            self._sync_v2_compat()
+        return deleted
+
+    def move_channel_mappings(self, db_ids: list[int], webhook_db_id: int) -> int:
+        """Point many mappings at another webhook with one UPDATE; returns rows moved."""
+        if not db_ids:
+            return 0
+        with self._get_session() as session:
+            moved = (
+                session.query(ChannelMapping)
+                .filter(
+                    ChannelMapping.id.in_(db_ids),
+                    ChannelMapping.webhook_id != webhook_db_id,
+                )
+                .update(
+                    {ChannelMapping.webhook_id: webhook_db_id},
+                    synchronize_session=False,
+                )
+            )
+            session.commit()
+        if moved:
+            self._v2_dirty = True
+            self._sync_v2_compat()
+        return moved
+
     def add_transform_rule(
         self,
         transform_type: str,
@@ -611,7 +910,7 @@ class Database:
             )
             session.add(rule)
             session.commit()
-            session.refresh(rule)
+            session.expunge(rule)
             return rule
 
     def get_transform_rules(
@@ -628,11 +927,13 @@ class Database:
                 query = query.filter_by(group_id=group_id)
             if mapping_id is not None:
                 query = query.filter_by(mapping_id=mapping_id)
-            return query.order_by(TransformRule.priority.desc()).all()
+            rules = query.order_by(TransformRule.priority.desc()).all()
+            session.expunge_all()
+            return rules
 
     def delete_transform_rule(self, db_id: int) -> bool:
         with self._get_session() as session:
-            rule = session.query(TransformRule).filter_by(id=db_id).first()
+            rule = session.get(TransformRule, db_id)
             if rule:
                 session.delete(rule)
                 session.commit()
@@ -661,7 +962,7 @@ class Database:
             )
             session.add(log)
             session.commit()
-            session.refresh(log)
+            session.expunge(log)
             return log
 
     def add_forward_log_v2(
@@ -675,50 +976,100 @@ class Database:
         has_media: bool = False,
         status: str = "success",
         error_message: Optional[str] = None,
-    ) -> ForwardLogV2:
+    ) -> None:
+        self.add_forward_logs_v2_bulk(
+            [
+                {
+                    "route_mapping_id": route_mapping_id,
+                    "telegram_message_id": telegram_message_id,
+                    "destination_type": destination_type,
+                    "destination_name": destination_name,
+                    "original_text": original_text,
+                    "transformed_text": transformed_text,
+                    "has_media": has_media,
+                    "status": status,
+                    "error_message": error_message,
+                }
+            ]
+        )
+
+    def add_forward_logs_v2_bulk(self, rows: list[dict]) -> None:
+        """Insert many v2 forward log rows in a single transaction."""
+        if not rows:
+            return
+        if self._stamp_forward_logs_v2:
+            now = datetime.utcnow()
+            rows = [{"forwarded_at": now, **row} for row in rows]
         with self._get_session() as session:
-            log = ForwardLogV2(
-                route_mapping_id=route_mapping_id,
-                telegram_message_id=telegram_message_id,
-                destination_type=destination_type,
-                destination_name=destination_name,
-                original_text=original_text,
-                transformed_text=transformed_text,
-                has_media=has_media,
-                status=status,
-                error_message=error_message,
-            )
-            session.add(log)
+            session.execute(ForwardLogV2.__table__.insert(), rows)
             session.commit()
-            session.refresh(log)
-            return log
 
-    def get_forward_logs(self, limit: int = 100, offset: int = 0) -> list[ForwardLog]:
+    def get_forward_logs(
+        self,
+        limit: int = 100,
+        before: Optional[datetime] = None,
+        before_id: Optional[int] = None,
+    ) -> list[ForwardLog]:
         with self._get_session() as session:
-            return (
-                session.query(ForwardLog)
-                .order_by(ForwardLog.forwarded_at.desc())
-                .limit(limit)
-                .offset(offset)
-                .all()
+            query = session.query(ForwardLog).order_by(
+                ForwardLog.forwarded_at.desc(), ForwardLog.id.desc()
             )
+            if before is not None and before_id is not None:
+                # Bulk inserts share forwarded_at; page on (timestamp, id).
+                query = query.filter(
+                    tuple_(ForwardLog.forwarded_at, ForwardLog.id) < tuple_(before, before_id)
+                )
+            elif before is not None:
+                query = query.filter(ForwardLog.forwarded_at < before)
+            logs = query.limit(limit).all()
+            session.expunge_all()
+            return logs
 
     def get_forward_logs_v2(
-        self, limit: int = 100, offset: int = 0
+        self,
+        limit: int = 100,
+        before: Optional[datetime] = None,
+        before_id: Optional[int] = None,
     ) -> list[ForwardLogV2]:
         with self._get_session() as session:
-            return (
-                session.query(ForwardLogV2)
-                .order_by(ForwardLogV2.forwarded_at.desc())
-                .limit(limit)
-                .offset(offset)
-                .all()
+            query = session.query(ForwardLogV2).order_by(
+                ForwardLogV2.forwarded_at.desc(), ForwardLogV2.id.desc()
+            )
+            if before is not None and before_id is not None:
+                # Bulk inserts share forwarded_at; page on (timestamp, id).
+                query = query.filter(
+                    tuple_(ForwardLogV2.forwarded_at, ForwardLogV2.id) < tuple_(before, before_id)
+                )
+            elif before is not None:
+                query = query.filter(ForwardLogV2.forwarded_at < before)
+            logs = query.limit(limit).all()
+            session.expunge_all()
+            return logs
+
+    def stream_forward_logs(self, batch_size: int = 500) -> Iterator[ForwardLog]:
+        # A private session: the thread's scoped session may be closed by any
+        # other Database call made while the caller is still consuming rows.
+        with Session(self.engine) as session:
+            query = session.query(ForwardLog).order_by(
+                ForwardLog.forwarded_at.desc(), ForwardLog.id.desc()
+            )
+            yield from query.yield_per(batch_size)
+
+    def stream_forward_logs_v2(self, batch_size: int = 500) -> Iterator[ForwardLogV2]:
+        # A private session: the thread's scoped session may be closed by any
+        # other Database call made while the caller is still consuming rows.
+        with Session(self.engine) as session:
+            query = session.query(ForwardLogV2).order_by(
+                ForwardLogV2.forwarded_at.desc(), ForwardLogV2.id.desc()
             )
+            yield from query.yield_per(batch_size)
 
     def get_setting(self, key: str, default: Optional[str] = None) -> Optional[str]:
         with self._get_session() as session:
-            setting = session.query(AppSettings).filter_by(key=key).first()
-            return setting.value if setting else default
+            value = session.execute(
+                select(AppSettings.value).where(AppSettings.key == key)
+            ).scalar_one_or_none()
+            return value if value is not None else default
 
     def set_setting(self, key: str, value: str) -> AppSettings:
         with self._get_session() as session:
@@ -729,22 +1080,22 @@ class Database:
                 setting = AppSettings(key=key, value=value)
                 session.add(setting)
             session.commit()
-            session.refresh(setting)
+            session.expunge(setting)
             return setting
 
     def get_active_source_channel_ids(self) -> list[int]:
         with self._get_session() as session:
-            mappings = session.query(ChannelMapping).filter_by(is_active=True).all()
-            channel_ids = set()
-            for mapping in mappings:
-                channel = (
-                    session.query(TelegramChannel)
-                    .filter_by(id=mapping.channel_id)
-                    .first()
-                )
-                if channel and channel.is_active:
-                    channel_ids.add(channel.channel_id)
-            return list(channel_ids)
+            return list(
+                session.execute(
+                    select(TelegramChannel.channel_id)
+                    .join(ChannelMapping, ChannelMapping.channel_id == TelegramChannel.id)
+                    .where(
+                        ChannelMapping.is_active.is_(True),
+                        TelegramChannel.is_active.is_(True),
+                    )
+                    .distinct()
+                ).scalars()
+            )
 
     def add_destination(
         self, name: str, destination_type: str, is_active: bool = True
@@ -757,7 +1108,7 @@ class Database:
             )
             session.add(destination)
             session.commit()
-            session.refresh(destination)
+            session.expunge(destination)
             return destination
 
     def add_discord_destination(
@@ -775,18 +1126,14 @@ class Database:
                     .first()
                 )
                 if existing_config:
-                    destination = (
-                        session.query(Destination)
-                        .filter_by(id=existing_config.destination_id)
-                        .first()
-                    )
+                    destination = session.get(Destination, existing_config.destination_id)
                     if destination:
                         destination.name = name
                         destination.destination_type = DestinationType.DISCORD_WEBHOOK.value
                         destination.is_active = is_active
                         existing_config.webhook_url = webhook_url
                         session.commit()
-                        session.refresh(destination)
+                        session.expunge(destination)
                         return destination
 
             destination = Destination(
@@ -804,7 +1151,7 @@ class Database:
             )
             session.add(cfg)
             session.commit()
-            session.refresh(destination)
+            session.expunge(destination)
             return destination
 
     def add_telegram_destination(
@@ -830,7 +1177,7 @@ class Database:
             )
             session.add(cfg)
             session.commit()
-            session.refresh(destination)
+            session.expunge(destination)
             return destination
 
     def get_destinations(
@@ -844,55 +1191,101 @@ class Database:
                 query = query.filter_by(is_active=True)
             if destination_type:
                 query = query.filter_by(destination_type=destination_type)
-            return query.all()
+            rows = query.all()
+            session.expunge_all()
+            return rows
 
     def get_destination_rows(
         self,
         active_only: bool = False,
         destination_type: Optional[str] = None,
+    ) -> list[dict]:
+        return self._cached_rows(
+            ("destination_rows", active_only, destination_type),
+            lambda: self._load_destination_rows(active_only, destination_type),
+        )
+
+    def _load_destination_rows(
+        self, active_only: bool, destination_type: Optional[str]
     ) -> list[dict]:
         with self._get_session() as session:
-            query = (
-                session.query(Destination, DestinationDiscord, DestinationTelegram)
-                .outerjoin(
-                    DestinationDiscord, DestinationDiscord.destination_id == Destination.id
+            return self._destination_rows(session, active_only, destination_type)
+
+    def _destination_rows(
+        self,
+        session: Session,
+        active_only: bool,
+        destination_type: Optional[str],
+    ) -> list[dict]:
+        if destination_type == DestinationType.DISCORD_WEBHOOK.value:
+            query = session.query(Destination, DestinationDiscord).join(
+                DestinationDiscord, DestinationDiscord.destination_id == Destination.id
+            )
+            pairs = [
+                (destination, cfg, None)
+                for destination, cfg in self._filter_destinations(
+                    query, active_only, destination_type
                 )
-                .outerjoin(
-                    DestinationTelegram, DestinationTelegram.destination_id == Destination.id
+            ]
+        elif destination_type == DestinationType.TELEGRAM_CHAT.value:
+            query = session.query(Destination, DestinationTelegram).join(
+                DestinationTelegram, DestinationTelegram.destination_id == Destination.id
+            )
+            pairs = [
+                (destination, None, cfg)
+                for destination, cfg in self._filter_destinations(
+                    query, active_only, destination_type
                 )
+            ]
+        else:
+            query = session.query(Destination).options(
+                selectinload(Destination.discord_config),
+                selectinload(Destination.telegram_config),
+                # Any other relationship access here would be an N+1; fail loudly.
+                raiseload("*"),
             )
-            if active_only:
-                query = query.filter(Destination.is_active.is_(True))
-            if destination_type:
-                query = query.filter(Destination.destination_type == destination_type)
-
-            out: list[dict] = []
-            for destination, destination_discord, destination_telegram in query.all():
-                out.append(
-                    {
-                        "destination_id": destination.id,
-                        "destination_name": destination.name,
-                        "destination_type": destination.destination_type,
-                        "is_active": destination.is_active,
-                        "discord_webhook_url": destination_discord.webhook_url
-                        if destination_discord
-                        else None,
-                        "telegram_chat_id": destination_telegram.chat_id
-                        if destination_telegram
-                        else None,
-                        "telegram_topic_id": destination_telegram.topic_id
-                        if destination_telegram
-                        else None,
-                        "legacy_webhook_id": destination_discord.legacy_webhook_id
-                        if destination_discord
-                        else None,
-                    }
+            pairs = [
+                (destination, destination.discord_config, destination.telegram_config)
+                for destination in self._filter_destinations(
+                    query, active_only, destination_type
                 )
-            return out
+            ]
+
+        out: list[dict] = []
+        for destination, destination_discord, destination_telegram in pairs:
+            out.append(
+                {
+                    "destination_id": destination.id,
+                    "destination_name": destination.name,
+                    "destination_type": destination.destination_type,
+                    "is_active": destination.is_active,
+                    "discord_webhook_url": destination_discord.webhook_url
+                    if destination_discord
+                    else None,
+                    "telegram_chat_id": destination_telegram.chat_id
+                    if destination_telegram
+                    else None,
+                    "telegram_topic_id": destination_telegram.topic_id
+                    if destination_telegram
+                    else None,
+                    "legacy_webhook_id": destination_discord.legacy_webhook_id
+                    if destination_discord
+                    else None,
+                }
+            )
+        return out
+
+    @staticmethod
+    def _filter_destinations(query, active_only: bool, destination_type: Optional[str]):
+        if active_only:
+            query = query.filter(Destination.is_active.is_(True))
+        if destination_type:
+            query = query.filter(Destination.destination_type == destination_type)
+        return query.all()
 
     def get_destination(self, destination_id: int) -> Optional[Destination]:
         with self._get_session() as session:
-            return session.query(Destination).filter_by(id=destination_id).first()
+            return session.get(Destination, destination_id)
 
     def update_destination(
         self,
@@ -901,14 +1294,15 @@ class Database:
         is_active: Optional[bool] = None,
     ) -> bool:
         with self._get_session() as session:
-            destination = session.query(Destination).filter_by(id=destination_id).first()
+            destination = session.get(Destination, destination_id)
             if not destination:
                 return False
             if name is not None:
                 destination.name = name
             if is_active is not None:
                 destination.is_active = is_active
-            session.commit()
+            if self._has_changes(session):
+                session.commit()
             return True
 
     def update_discord_destination(
@@ -920,17 +1314,13 @@ class Database:
         is_active: Optional[bool] = None,
     ) -> bool:
         with self._get_session() as session:
-            destination = session.query(Destination).filter_by(id=destination_id).first()
+            destination = session.get(Destination, destination_id)
             if not destination:
                 return False
             if destination.destination_type != DestinationType.DISCORD_WEBHOOK.value:
                 return False
 
-            cfg = (
-                session.query(DestinationDiscord)
-                .filter_by(destination_id=destination_id)
-                .first()
-            )
+            cfg = session.get(DestinationDiscord, destination_id)
             if cfg is None:
                 return False
 
@@ -940,7 +1330,8 @@ class Database:
                 destination.is_active = is_active
             if webhook_url is not None:
                 cfg.webhook_url = webhook_url
-            session.commit()
+            if self._has_changes(session):
+                session.commit()
             return True
 
     def update_telegram_destination(
@@ -953,17 +1344,13 @@ class Database:
         is_active: Optional[bool] = None,
     ) -> bool:
         with self._get_session() as session:
-            destination = session.query(Destination).filter_by(id=destination_id).first()
+            destination = session.get(Destination, destination_id)
             if not destination:
                 return False
             if destination.destination_type != DestinationType.TELEGRAM_CHAT.value:
                 return False
 
-            cfg = (
-                session.query(DestinationTelegram)
-                .filter_by(destination_id=destination_id)
-                .first()
-            )
+            cfg = session.get(DestinationTelegram, destination_id)
             if cfg is None:
                 return False
 
@@ -974,12 +1361,13 @@ class Database:
             if chat_id is not None:
                 cfg.chat_id = chat_id
             cfg.topic_id = topic_id
-            session.commit()
+            if self._has_changes(session):
+                session.commit()
             return True
 
     def delete_destination(self, destination_id: int) -> bool:
         with self._get_session() as session:
-            destination = session.query(Destination).filter_by(id=destination_id).first()
+            destination = session.get(Destination, destination_id)
             if not destination:
                 return False
             session.delete(destination)
@@ -1006,7 +1394,7 @@ class Database:
                 if legacy_channel_mapping_id is not None:
                     existing.legacy_channel_mapping_id = legacy_channel_mapping_id
                 session.commit()
-                session.refresh(existing)
+                session.expunge(existing)
                 return existing
 
             mapping = RouteMapping(
@@ -1018,87 +1406,135 @@ class Database:
             )
             session.add(mapping)
             session.commit()
-            session.refresh(mapping)
+            session.expunge(mapping)
             return mapping
 
+    def add_route_mappings_bulk(
+        self, keys: list[tuple[int, int, Optional[int]]]
+    ) -> int:
+        """Create active (source_channel_db_id, destination_id, group_id) routes
+        in a single transaction.
+
+        Keys that already have a route are skipped. Returns the number created.
+        """
+        if not keys:
+            return 0
+        with self._get_session() as session:
+            existing = set(
+                session.execute(
+                    select(
+                        RouteMapping.source_channel_id,
+                        RouteMapping.destination_id,
+                        RouteMapping.group_id,
+                    ).where(
+                        RouteMapping.destination_id.in_({d for _, d, _ in keys}),
+                        RouteMapping.source_channel_id.in_({s for s, _, _ in keys}),
+                    )
+                ).tuples()
+            )
+            new_keys = [k for k in dict.fromkeys(keys) if k not in existing]
+            if not new_keys:
+                return 0
+            session.execute(
+                RouteMapping.__table__.insert(),
+                [
+                    {
+                        "source_channel_id": s,
+                        "destination_id": d,
+                        "group_id": g,
+                        "is_active": True,
+                    }
+                    for s, d, g in new_keys
+                ],
+            )
+            session.commit()
+            return len(new_keys)
+
     def get_route_mappings(self, active_only: bool = False) -> list[RouteMapping]:
         self._sync_v2_compat()
         with self._get_session() as session:
             query = session.query(RouteMapping)
             if active_only:
                 query = query.filter_by(is_active=True)
-            return query.all()
+            rows = query.all()
+            session.expunge_all()
+            return rows
 
     def get_route_rows(self, active_only: bool = False) -> list[dict]:
         self._sync_v2_compat()
+        return self._cached_rows(
+            ("route_rows", active_only),
+            lambda: self._load_route_rows(active_only),
+        )
+
+    def _load_route_rows(self, active_only: bool) -> list[dict]:
         with self._get_session() as session:
-            query = (
-                session.query(
-                    RouteMapping,
-                    TelegramChannel,
-                    Destination,
-                    DestinationDiscord,
-                    DestinationTelegram,
-                )
-                .join(TelegramChannel, RouteMapping.source_channel_id == TelegramChannel.id)
-                .join(Destination, RouteMapping.destination_id == Destination.id)
-                .outerjoin(
-                    DestinationDiscord, DestinationDiscord.destination_id == Destination.id
-                )
-                .outerjoin(
-                    DestinationTelegram, DestinationTelegram.destination_id == Destination.id
-                )
-            )
-            if active_only:
-                query = query.filter(
-                    RouteMapping.is_active.is_(True),
-                    TelegramChannel.is_active.is_(True),
-                    Destination.is_active.is_(True),
-                )
+            return self._route_rows(session, active_only)
 
-            out: list[dict] = []
-            for (
-                route,
-                channel,
-                destination,
-                destination_discord,
-                destination_telegram,
-            ) in query.all():
-                out.append(
-                    {
-                        "route_id": route.id,
-                        "route_is_active": route.is_active,
-                        "group_id": route.group_id,
-                        "legacy_channel_mapping_id": route.legacy_channel_mapping_id,
-                        "source_channel_db_id": channel.id,
-                        "source_channel_id": channel.channel_id,
-                        "source_channel_name": channel.name,
-                        "source_channel_username": channel.username,
-                        "destination_id": destination.id,
-                        "destination_name": destination.name,
-                        "destination_type": destination.destination_type,
-                        "discord_webhook_url": destination_discord.webhook_url
-                        if destination_discord
-                        else None,
-                        "telegram_chat_id": destination_telegram.chat_id
-                        if destination_telegram
-                        else None,
-                        "telegram_topic_id": destination_telegram.topic_id
-                        if destination_telegram
-                        else None,
-                    }
-                )
-            return out
+    @staticmethod
+    def _route_rows(session: Session, active_only: bool) -> list[dict]:
+        # Column-level SELECT: rows come back as plain mappings, no ORM instances.
+        stmt = (
+            select(
+                RouteMapping.id.label("route_id"),
+                RouteMapping.is_active.label("route_is_active"),
+                RouteMapping.group_id,
+                RouteMapping.legacy_channel_mapping_id,
+                TelegramChannel.id.label("source_channel_db_id"),
+                TelegramChannel.channel_id.label("source_channel_id"),
+                TelegramChannel.name.label("source_channel_name"),
+                TelegramChannel.username.label("source_channel_username"),
+                Destination.id.label("destination_id"),
+                Destination.name.label("destination_name"),
+                Destination.destination_type,
+                DestinationDiscord.webhook_url.label("discord_webhook_url"),
+                DestinationTelegram.chat_id.label("telegram_chat_id"),
+                DestinationTelegram.topic_id.label("telegram_topic_id"),
+            )
+            .join(TelegramChannel, RouteMapping.source_channel_id == TelegramChannel.id)
+            .join(Destination, RouteMapping.destination_id == Destination.id)
+            .outerjoin(
+                DestinationDiscord, DestinationDiscord.destination_id == Destination.id
+            )
+            .outerjoin(
+                DestinationTelegram, DestinationTelegram.destination_id == Destination.id
+            )
+            .order_by(RouteMapping.id)
+        )
+        if active_only:
+            stmt = stmt.where(
+                RouteMapping.is_active.is_(True),
+                TelegramChannel.is_active.is_(True),
+                Destination.is_active.is_(True),
+            )
+        return [dict(row) for row in session.execute(stmt).mappings()]
 
     def toggle_route_mapping(self, mapping_id: int, is_active: bool) -> bool:
         with self._get_session() as session:
-            mapping = session.query(RouteMapping).filter_by(id=mapping_id).first()
+            mapping = session.get(RouteMapping, mapping_id)
             if not mapping:
                 return False
-            mapping.is_active = is_active
-            session.commit()
+            if mapping.is_active != is_active:
+                mapping.is_active = is_active
+                session.commit()
             return True
 
+    def set_route_mappings_active(self, mapping_ids: list[int], is_active: bool) -> int:
+        """Enable or disable many routes with one UPDATE; returns rows changed."""
+        if not mapping_ids:
+            return 0
+        with self._get_session() as session:
+            changed = (
+                session.query(RouteMapping)
+                .filter(
+                    RouteMapping.id.in_(mapping_ids),
+                    RouteMapping.is_active.is_not(is_active),
+                )
+                .update({RouteMapping.is_active: is_active}, synchronize_session=False)
+            )
+            session.commit()
+            return changed
+
     def update_route_mapping(
         self,
         mapping_id: int,
@@ -1107,20 +1543,38 @@ class Database:
         group_id: Optional[int] = None,
     ) -> bool:
         with self._get_session() as session:
-            mapping = session.query(RouteMapping).filter_by(id=mapping_id).first()
+            mapping = session.get(RouteMapping, mapping_id)
             if not mapping:
                 return False
             if destination_id is not None:
                 mapping.destination_id = destination_id
             mapping.group_id = group_id
-            session.commit()
+            if self._has_changes(session):
+                session.commit()
             return True
 
     def delete_route_mapping(self, mapping_id: int) -> bool:
         with self._get_session() as session:
-            mapping = session.query(RouteMapping).filter_by(id=mapping_id).first()
+            mapping = session.get(RouteMapping, mapping_id)
             if not mapping:
                 return False
             session.delete(mapping)
             session.commit()
             return True
+
+    def doctor_snapshot(self) -> DoctorSnapshot:
+        """Read everything `teleforward doctor` checks in one session."""
+        self._sync_v2_compat()
+        with self._get_session() as session:
+            channels = session.query(TelegramChannel).filter_by(is_active=True).all()
+            session.expunge_all()
+            return DoctorSnapshot(
+                channels=channels,
+                destination_rows=self._destination_rows(session, True, None),
+                route_rows=self._route_rows(session, True),
+                session_string=session.execute(
+                    select(AppSettings.value).where(
+                        AppSettings.key == "telegram_session_string"
+                    )
+                ).scalar_one_or_none(),
+            )
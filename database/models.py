@@ -1,6 +1,7 @@
 import json
 from datetime import datetime
 from enum import Enum
+from functools import lru_cache
 from typing import Optional
 import os
 from sqlalchemy import (
@@ -12,9 +13,12 @@ from sqlalchemy import (
     String,
     DateTime,
     UniqueConstraint,
+    Index,
+    bindparam,
     event,
     text,
 )
+from sqlalchemy.pool import QueuePool
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship, Session
 from pathlib import Path
 
@@ -23,6 +27,11 @@ class Base(DeclarativeBase):
     pass
 
 
+# UTC "now" in SQLAlchemy's SQLite DateTime storage format, so DB-stamped values
+# sort and compare correctly against Python-bound datetimes (keyset cursors).
+_UTC_NOW_DEFAULT = text("(strftime('%Y-%m-%d %H:%M:%f000', 'now'))")
+
+
 class TransformType(str, Enum):
     KEYWORD_WHITELIST = "keyword_whitelist"
     KEYWORD_BLACKLIST = "keyword_blacklist"
@@ -38,6 +47,10 @@ class DestinationType(str, Enum):
     TELEGRAM_CHAT = "telegram_chat"
 
 
+# Bound as a plain string by the raw-SQL v1 -> v2 sync.
+_DISCORD_WEBHOOK_TYPE = DestinationType.DISCORD_WEBHOOK.value
+
+
 class TelegramChannel(Base):
     __tablename__ = "telegram_channels"
 
@@ -130,6 +143,10 @@ class ForwardingGroup(Base):
 
 class ChannelMapping(Base):
     __tablename__ = "channel_mappings"
+    __table_args__ = (
+        Index("ix_channel_mappings_channel_id_is_active", "channel_id", "is_active"),
+        Index("ix_channel_mappings_webhook_id_channel_id", "webhook_id", "channel_id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     channel_id: Mapped[int] = mapped_column(
@@ -200,6 +217,15 @@ class DestinationTelegram(Base):
 
 class RouteMapping(Base):
     __tablename__ = "route_mappings"
+    __table_args__ = (
+        Index(
+            "ix_route_mappings_destination_id_source_channel_id",
+            "destination_id",
+            "source_channel_id",
+        ),
+        Index("ix_route_mappings_source_channel_id", "source_channel_id"),
+        Index("ix_route_mappings_is_active_destination_id", "is_active", "destination_id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     source_channel_id: Mapped[int] = mapped_column(
@@ -235,7 +261,7 @@ class TransformRule(Base):
         ForeignKey("forwarding_groups.id", ondelete="CASCADE"), nullable=True
     )
     mapping_id: Mapped[Optional[int]] = mapped_column(
-        ForeignKey("channel_mappings.id", ondelete="CASCADE"), nullable=True
+        ForeignKey("channel_mappings.id", ondelete="CASCADE"), nullable=True, index=True
     )
     transform_type: Mapped[str] = mapped_column(String(50))
     pattern: Mapped[str] = mapped_column(Text)
@@ -251,6 +277,9 @@ class TransformRule(Base):
 
 class ForwardLog(Base):
     __tablename__ = "forward_logs"
+    __table_args__ = (
+        Index("ix_forward_logs_forwarded_at_id", "forwarded_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     mapping_id: Mapped[int] = mapped_column(
@@ -267,6 +296,9 @@ class ForwardLog(Base):
 
 class ForwardLogV2(Base):
     __tablename__ = "forward_logs_v2"
+    __table_args__ = (
+        Index("ix_forward_logs_v2_forwarded_at_id", "forwarded_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     route_mapping_id: Mapped[int] = mapped_column(
@@ -280,7 +312,12 @@ class ForwardLogV2(Base):
     has_media: Mapped[bool] = mapped_column(Boolean, default=False)
     status: Mapped[str] = mapped_column(String(50), default="success")
     error_message: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
-    forwarded_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    # Stamped by SQLite on the forwarder's hot insert path instead of binding a
+    # Python datetime per row. Tables created before this default existed get
+    # the value from Database.add_forward_logs_v2_bulk instead.
+    forwarded_at: Mapped[datetime] = mapped_column(
+        DateTime, server_default=_UTC_NOW_DEFAULT
+    )
 
 
 class AppSettings(Base):
@@ -294,6 +331,12 @@ class AppSettings(Base):
     )
 
 
+# Bump whenever init_db's create/migrate steps change, so existing databases
+# run them once more; at the current version startup skips them entirely.
+SCHEMA_VERSION = 2
+_SCHEMA_VERSION_KEY = "schema_version"
+
+
 def get_db_path(database_path: Optional[str] = None) -> Path:
     if database_path:
         db_path = Path(database_path)
@@ -307,13 +350,39 @@ def get_db_path(database_path: Optional[str] = None) -> Path:
 
 def get_engine(database_path: Optional[str] = None):
     db_path = get_db_path(database_path=database_path).resolve()
-    engine = create_engine(f"sqlite:///{db_path.as_posix()}", echo=False)
+    return _get_engine_for_path(db_path.as_posix())
+
+
+@lru_cache(maxsize=None)
+def _get_engine_for_path(db_path: str):
+    """One engine (and connection pool) per database file for the process."""
+    engine = create_engine(
+        f"sqlite:///{db_path}",
+        echo=False,
+        # Room for every statement shape Database issues, so none are recompiled.
+        query_cache_size=1000,
+        # Readers on the event-loop thread plus the to_thread log writers: keep
+        # that many connections (and their PRAGMA setup) warm. StaticPool would
+        # interleave per-thread sessions on one connection; NullPool would
+        # reconnect and re-run the PRAGMAs on every checkout.
+        poolclass=QueuePool,
+        pool_size=3,
+        max_overflow=5,
+    )
 
     @event.listens_for(engine, "connect")
     def _set_sqlite_pragma(dbapi_connection, _connection_record):
         try:
             cursor = dbapi_connection.cursor()
             cursor.execute("PRAGMA foreign_keys=ON")
+            # WAL + NORMAL sync: one fsync per checkpoint instead of per commit.
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute("PRAGMA temp_store=MEMORY")
+            cursor.execute("PRAGMA cache_size=-65536")
+            cursor.execute("PRAGMA mmap_size=268435456")
+            # Let TUI reads wait briefly on the forwarder's log writes instead of failing.
+            cursor.execute("PRAGMA busy_timeout=5000")
             cursor.close()
         except Exception:
             pass
@@ -323,21 +392,69 @@ def get_engine(database_path: Optional[str] = None):
 
 def init_db(database_path: Optional[str] = None):
     engine = get_engine(database_path=database_path)
-    Base.metadata.create_all(engine)
-    _ensure_schema_updates(engine)
-    _migrate_source_groups_to_memberships(engine)
-    _sync_v2_from_v1(engine)
+    if not _schema_is_current(engine):
+        Base.metadata.create_all(engine)
+        _ensure_schema_updates(engine)
+        _migrate_source_groups_to_memberships(engine)
+        _sync_v2_from_v1(engine)
+        _mark_schema_current(engine)
 
     if os.name == "posix":
         try:
             db_path = get_db_path(database_path=database_path)
-            if db_path.exists():
-                os.chmod(db_path, 0o600)
+            for path in (
+                db_path,
+                db_path.with_name(f"{db_path.name}-wal"),
+                db_path.with_name(f"{db_path.name}-shm"),
+            ):
+                if path.exists():
+                    os.chmod(path, 0o600)
         except OSError:
             pass
     return engine
 
 
+def forward_logs_v2_stamped_by_db(engine) -> bool:
+    """Whether forward_logs_v2.forwarded_at has its server default.
+
+    SQLite cannot add a default to an existing column, so tables created by
+    older builds keep needing the timestamp bound on insert.
+    """
+    with engine.connect() as conn:
+        for row in conn.execute(text("PRAGMA table_info(forward_logs_v2)")).mappings():
+            if row["name"] == "forwarded_at":
+                return row["dflt_value"] is not None
+    return False
+
+
+def _schema_is_current(engine) -> bool:
+    with engine.connect() as conn:
+        if not _tables_exist(conn, ("app_settings",)):
+            return False
+        stored = conn.execute(
+            text("SELECT value FROM app_settings WHERE key=:key LIMIT 1"),
+            {"key": _SCHEMA_VERSION_KEY},
+        ).scalar()
+    return stored == str(SCHEMA_VERSION)
+
+
+def _mark_schema_current(engine) -> None:
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO app_settings (key, value, updated_at) "
+                "VALUES (:key, :value, :updated_at) "
+                "ON CONFLICT(key) DO UPDATE SET "
+                "value = excluded.value, updated_at = excluded.updated_at"
+            ),
+            {
+                "key": _SCHEMA_VERSION_KEY,
+                "value": str(SCHEMA_VERSION),
+                "updated_at": datetime.utcnow(),
+            },
+        )
+
+
 def _ensure_schema_updates(engine) -> None:
     with engine.begin() as conn:
         has_table = conn.execute(
@@ -358,6 +475,24 @@ def _ensure_schema_updates(engine) -> None:
                 text("ALTER TABLE telegram_channels ADD COLUMN source_group VARCHAR(255)")
             )
 
+        # create_all() skips tables that already exist, including their indexes.
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
+
+
+def _tables_exist(conn, table_names: tuple[str, ...]) -> bool:
+    present = {
+        row[0]
+        for row in conn.execute(
+            text(
+                "SELECT name FROM sqlite_master WHERE type='table' AND name IN :names"
+            ).bindparams(bindparam("names", expanding=True)),
+            {"names": list(table_names)},
+        )
+    }
+    return present.issuperset(table_names)
+
 
 def _migrate_source_groups_to_memberships(engine) -> None:
     """Idempotent migration from legacy telegram_channels.source_group to memberships."""
@@ -368,16 +503,8 @@ def _migrate_source_groups_to_memberships(engine) -> None:
             "source_groups",
             "source_group_memberships",
         )
-        for table_name in required_tables:
-            exists = conn.execute(
-                text(
-                    "SELECT 1 FROM sqlite_master "
-                    "WHERE type='table' AND name=:name LIMIT 1"
-                ),
-                {"name": table_name},
-            ).scalar()
-            if not exists:
-                return
+        if not _tables_exist(conn, required_tables):
+            return
 
         existing_group_names: dict[str, str] = {}
         for row in conn.execute(text("SELECT name FROM source_groups")).mappings():
@@ -430,6 +557,7 @@ def _migrate_source_groups_to_memberships(engine) -> None:
             if group_name and group_name.lower() not in group_id_by_key:
                 group_id_by_key[group_name.lower()] = int(row["id"])
 
+        memberships: list[dict] = []
         for row in channel_rows:
             group_name = ensure_group(str(row["source_group"]))
             if not group_name:
@@ -443,17 +571,23 @@ def _migrate_source_groups_to_memberships(engine) -> None:
                     ).scalar()
                 )
                 group_id_by_key[group_name.lower()] = group_id
+            memberships.append(
+                {
+                    "source_channel_id": int(row["id"]),
+                    "source_group_id": group_id,
+                    "created_at": datetime.utcnow(),
+                }
+            )
+
+        if memberships:
+            # One executemany instead of a statement per channel.
             conn.execute(
                 text(
                     "INSERT OR IGNORE INTO source_group_memberships "
                     "(source_channel_id, source_group_id, created_at) "
                     "VALUES (:source_channel_id, :source_group_id, :created_at)"
                 ),
-                {
-                    "source_channel_id": int(row["id"]),
-                    "source_group_id": group_id,
-                    "created_at": datetime.utcnow(),
-                },
+                memberships,
             )
 
 
@@ -468,128 +602,69 @@ def _sync_v2_from_v1(engine) -> None:
             "destination_discord",
             "route_mappings",
         )
-        for table_name in required_tables:
-            exists = conn.execute(
-                text(
-                    "SELECT 1 FROM sqlite_master "
-                    "WHERE type='table' AND name=:name LIMIT 1"
-                ),
-                {"name": table_name},
-            ).scalar()
-            if not exists:
-                return
-
-        webhook_rows = conn.execute(
-            text(
-                "SELECT id, name, url, is_active, created_at "
-                "FROM discord_webhooks"
-            )
-        ).mappings()
+        if not _tables_exist(conn, required_tables):
+            return
 
         # v2 is now the source of truth.
         # This sync is intentionally "insert-only" for legacy backfill:
         # - create missing v2 records from v1 rows
         # - do not overwrite existing v2 rows
         # - do not delete existing v2 rows
-        for row in webhook_rows:
-            destination_id = conn.execute(
+        #
+        # Each step is one set-based statement. New destination ids are assigned
+        # explicitly (MAX(id) + row number in legacy id order) so destinations and
+        # destination_discord rows can be inserted separately yet stay paired.
+        missing_webhooks = (
+            "FROM discord_webhooks w "
+            "WHERE NOT EXISTS ("
+            "SELECT 1 FROM destination_discord dd WHERE dd.legacy_webhook_id = w.id"
+            ")"
+        )
+        base_destination_id = conn.execute(
+            text("SELECT COALESCE(MAX(id), 0) FROM destinations")
+        ).scalar()
+        inserted = conn.execute(
+            text(
+                "INSERT INTO destinations "
+                "(id, name, destination_type, is_active, created_at) "
+                "SELECT :base_id + ROW_NUMBER() OVER (ORDER BY w.id), "
+                "w.name, :destination_type, w.is_active, w.created_at "
+                f"{missing_webhooks}"
+            ),
+            {
+                "base_id": base_destination_id,
+                "destination_type": _DISCORD_WEBHOOK_TYPE,
+            },
+        ).rowcount
+        if inserted:
+            conn.execute(
                 text(
-                    "SELECT destination_id FROM destination_discord "
-                    "WHERE legacy_webhook_id = :legacy_webhook_id"
+                    "INSERT INTO destination_discord "
+                    "(destination_id, webhook_url, legacy_webhook_id) "
+                    "SELECT :base_id + ROW_NUMBER() OVER (ORDER BY w.id), w.url, w.id "
+                    f"{missing_webhooks}"
                 ),
-                {"legacy_webhook_id": row["id"]},
-            ).scalar()
-
-            if destination_id is None:
-                insert_result = conn.execute(
-                    text(
-                        "INSERT INTO destinations "
-                        "(name, destination_type, is_active, created_at) "
-                        "VALUES (:name, :destination_type, :is_active, :created_at)"
-                    ),
-                    {
-                        "name": row["name"],
-                        "destination_type": DestinationType.DISCORD_WEBHOOK.value,
-                        "is_active": row["is_active"],
-                        "created_at": row["created_at"],
-                    },
-                )
-                destination_id = insert_result.lastrowid
-                if destination_id is None:
-                    destination_id = conn.execute(
-                        text(
-                            "SELECT id FROM destinations "
-                            "WHERE destination_type = :destination_type "
-                            "ORDER BY id DESC LIMIT 1"
-                        ),
-                        {
-                            "destination_type": DestinationType.DISCORD_WEBHOOK.value,
-                        },
-                    ).scalar()
-                if destination_id is None:
-                    continue
-
-                conn.execute(
-                    text(
-                        "INSERT INTO destination_discord "
-                        "(destination_id, webhook_url, legacy_webhook_id) "
-                        "VALUES (:destination_id, :webhook_url, :legacy_webhook_id)"
-                    ),
-                    {
-                        "destination_id": destination_id,
-                        "webhook_url": row["url"],
-                        "legacy_webhook_id": row["id"],
-                    },
-                )
+                {"base_id": base_destination_id},
+            )
 
-        mapping_rows = conn.execute(
+        conn.execute(
             text(
-                "SELECT id, channel_id, webhook_id, group_id, is_active, created_at "
-                "FROM channel_mappings"
+                "INSERT INTO route_mappings "
+                "("
+                "source_channel_id, destination_id, group_id, "
+                "is_active, created_at, legacy_channel_mapping_id"
+                ") "
+                "SELECT cm.channel_id, dd.destination_id, cm.group_id, "
+                "cm.is_active, cm.created_at, cm.id "
+                "FROM channel_mappings cm "
+                "JOIN destination_discord dd ON dd.legacy_webhook_id = cm.webhook_id "
+                "WHERE NOT EXISTS ("
+                "SELECT 1 FROM route_mappings rm "
+                "WHERE rm.legacy_channel_mapping_id = cm.id"
+                ") "
+                "ORDER BY cm.id"
             )
-        ).mappings()
-
-        for row in mapping_rows:
-            destination_id = conn.execute(
-                text(
-                    "SELECT destination_id FROM destination_discord "
-                    "WHERE legacy_webhook_id = :legacy_webhook_id"
-                ),
-                {"legacy_webhook_id": row["webhook_id"]},
-            ).scalar()
-            if destination_id is None:
-                continue
-
-            existing_route_id = conn.execute(
-                text(
-                    "SELECT id FROM route_mappings "
-                    "WHERE legacy_channel_mapping_id = :legacy_mapping_id"
-                ),
-                {"legacy_mapping_id": row["id"]},
-            ).scalar()
-
-            params = {
-                "source_channel_id": row["channel_id"],
-                "destination_id": destination_id,
-                "group_id": row["group_id"],
-                "is_active": row["is_active"],
-                "created_at": row["created_at"],
-                "legacy_channel_mapping_id": row["id"],
-            }
-            if existing_route_id is None:
-                conn.execute(
-                    text(
-                        "INSERT INTO route_mappings "
-                        "("
-                        "source_channel_id, destination_id, group_id, "
-                        "is_active, created_at, legacy_channel_mapping_id"
-                        ") VALUES ("
-                        ":source_channel_id, :destination_id, :group_id, "
-                        ":is_active, :created_at, :legacy_channel_mapping_id"
-                        ")"
-                    ),
-                    params,
-                )
+        )
 
 
 def get_session(database_path: Optional[str] = None) -> Session:
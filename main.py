@@ -1,10 +1,16 @@
+import codecs
 import logging
+import os
+import re
+import stat
 import sys
+import tempfile
 import argparse
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 
-from dotenv import dotenv_values, set_key, unset_key
 from env_paths import resolve_env_file_path
 
 sys.path.insert(0, str(Path(__file__).parent))
@@ -23,63 +29,252 @@ EDITABLE_ENV_KEYS = (
     "DISCORD_STRIP_URLS",
     "DISCORD_INCLUDE_TELEGRAM_LINK",
 )
+# Shown masked by `config show`.
+SECRET_ENV_KEYS = frozenset(
+    {
+        "TELEGRAM_API_HASH",
+        "TELEGRAM_SESSION_STRING",
+        "TELEGRAM_BOT_TOKEN",
+    }
+)
 
 
+@lru_cache(maxsize=1)
 def _env_path() -> Path:
     return resolve_env_file_path()
 
 
+_MASK_STARS = "*" * 64
+
+
 def _mask_secret(value: Optional[str], keep_start: int = 8, keep_end: int = 6) -> str:
     if not value:
         return "(unset)"
-    if len(value) <= keep_start + keep_end:
-        return "*" * len(value)
+    length = len(value)
+    if length <= keep_start + keep_end:
+        return _MASK_STARS[:length] if length <= len(_MASK_STARS) else "*" * length
     return f"{value[:keep_start]}...{value[-keep_end:]}"
 
 
+# Same grammar as python-dotenv (export prefix, quoting, escapes, quoted values
+# spanning lines, inline comments, ${VAR:-default}); _rewrite_env_key handles
+# writes.
+_ENV_LINE_RE = re.compile(r"^\s*(?:export\s+)?([^=#\s]+)\s*=\s*(.*)$", re.DOTALL)
+_ENV_SINGLE_QUOTED_RE = re.compile(r"'((?:\\.|[^'\\])*)'")
+_ENV_DOUBLE_QUOTED_RE = re.compile(r'"((?:\\.|[^"\\])*)"')
+_ENV_SINGLE_ESCAPES_RE = re.compile(r"\\[\\']")
+_ENV_DOUBLE_ESCAPES_RE = re.compile(r"\\[\\'\"abfnrtv]")
+_ENV_INLINE_COMMENT_RE = re.compile(r"\s+#.*")
+_ENV_VARIABLE_RE = re.compile(r"\$\{([^}:]*)(?::-([^}]*))?\}")
+
+
+def _decode_env_escapes(regex: re.Pattern, value: str) -> str:
+    return regex.sub(lambda m: codecs.decode(m.group(0), "unicode-escape"), value)
+
+
+def _iter_env_lines(content: str) -> Iterator[tuple[str, str]]:
+    """Yield (logical line, raw text) pairs, joining quoted values across lines.
+
+    The raw text keeps its line endings; a quote that never closes leaves its
+    line on its own, which _parse_env_line then rejects.
+    """
+    physical = content.splitlines(keepends=True)
+    i = 0
+    while i < len(physical):
+        raw = physical[i]
+        i += 1
+        match = _ENV_LINE_RE.match(raw.rstrip("\r\n"))
+        quote = match.group(2)[:1] if match else ""
+        if quote in {"'", '"'}:
+            quoted_re = _ENV_SINGLE_QUOTED_RE if quote == "'" else _ENV_DOUBLE_QUOTED_RE
+            joined = raw
+            for j in range(i, len(physical) + 1):
+                value = _ENV_LINE_RE.match(joined.rstrip("\r\n")).group(2)
+                if quoted_re.match(value):
+                    raw, i = joined, j
+                    break
+                if j < len(physical):
+                    joined += physical[j]
+        yield raw.rstrip("\r\n"), raw
+
+
+def _parse_env_line(line: str) -> Optional[tuple[str, str]]:
+    """Return (key, raw value) for an assignment line, before ${VAR} expansion."""
+    match = _ENV_LINE_RE.match(line)
+    if not match:
+        return None
+    key, value = match.group(1), match.group(2)
+    if value[:1] == "'":
+        quoted = _ENV_SINGLE_QUOTED_RE.match(value)
+        if not quoted:
+            return None
+        return key, _decode_env_escapes(_ENV_SINGLE_ESCAPES_RE, quoted.group(1))
+    if value[:1] == '"':
+        quoted = _ENV_DOUBLE_QUOTED_RE.match(value)
+        if not quoted:
+            return None
+        return key, _decode_env_escapes(_ENV_DOUBLE_ESCAPES_RE, quoted.group(1))
+    return key, _ENV_INLINE_COMMENT_RE.sub("", value).rstrip()
+
+
+def _read_env_file(env_path: Path) -> Optional[str]:
+    try:
+        return env_path.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return None
+
+
+def _parse_env_file(env_path: Path) -> dict[str, str]:
+    content = _read_env_file(env_path)
+    if content is None:
+        return {}
+
+    values: dict[str, str] = {}
+
+    def _resolve(match: re.Match) -> str:
+        name, default = match.group(1), match.group(2)
+        found = values.get(name, os.environ.get(name))
+        if found is None:
+            found = default
+        return found or ""
+
+    for line, _ in _iter_env_lines(content):
+        parsed = _parse_env_line(line)
+        if parsed is None:
+            continue
+        key, value = parsed
+        if "${" in value:
+            value = _ENV_VARIABLE_RE.sub(_resolve, value)
+        values[key] = value
+    return values
+
+
+# Parsed once per process; _set_env_value/_unset_env_value invalidate it.
+@lru_cache(maxsize=1)
 def _load_env_values() -> dict[str, str]:
-    raw = dotenv_values(dotenv_path=_env_path())
-    out: dict[str, str] = {}
-    for key, value in raw.items():
-        if key and value is not None:
-            out[str(key)] = str(value)
-    return out
+    return _parse_env_file(_env_path())
+
+
+def _get_env_value(key: str) -> Optional[str]:
+    """Look up one key, scanning from the end since the last assignment wins."""
+    content = _read_env_file(_env_path())
+    if content is None:
+        return None
+    for line, _ in reversed(list(_iter_env_lines(content))):
+        parsed = _parse_env_line(line)
+        if parsed is None or parsed[0] != key:
+            continue
+        if "${" in parsed[1]:
+            # Expansion can depend on earlier lines; resolve against the full file.
+            return _load_env_values().get(key)
+        return parsed[1]
+    return None
+
+
+def _format_env_line(key: str, value: str) -> str:
+    # Quotes like python-dotenv's set_key(quote_mode="auto"), but also escapes
+    # backslashes so _parse_env_line (and dotenv) read the value back unchanged.
+    if value.isalnum():
+        return f"{key}={value}\n"
+    escaped = value.replace("\\", "\\\\").replace("'", "\\'")
+    return f"{key}='{escaped}'\n"
+
+
+def _rewrite_env_key(env_path: Path, key: str, line_out: Optional[str]) -> bool:
+    """Replace (or with line_out=None, drop) every assignment of key in one pass.
+
+    Appends line_out when the key is absent. A symlinked file is written through
+    to its target. The file is replaced atomically and stays owner-only (its
+    mode is kept, never wider than 0o600) since it holds secrets. Returns False
+    when nothing needed writing.
+    """
+    env_path = env_path.resolve()
+    content = _read_env_file(env_path)
+    original_mode = None
+    if content is not None:
+        original_mode = stat.S_IMODE(os.stat(env_path).st_mode) & 0o600
+
+    out: list[str] = []
+    replaced = False
+    for logical, line in _iter_env_lines(content or ""):
+        match = _ENV_LINE_RE.match(logical)
+        if match and match.group(1) == key:
+            if line_out is not None and not replaced:
+                out.append(line_out)
+            replaced = True
+            continue
+        out.append(line)
+
+    if not replaced:
+        if line_out is None:
+            return False
+        if out and not out[-1].endswith("\n"):
+            out[-1] += "\n"
+        out.append(line_out)
+
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp_", dir=env_path.parent)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            handle.write("".join(out))
+        if original_mode is not None:
+            os.chmod(tmp_path, original_mode)
+        os.replace(tmp_path, env_path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+    return True
 
 
 def _set_env_value(key: str, value: str) -> None:
     env_path = _env_path()
     env_path.parent.mkdir(parents=True, exist_ok=True)
-    if not env_path.exists():
-        env_path.touch()
-    set_key(str(env_path), key, value, quote_mode="auto")
+    _rewrite_env_key(env_path, key, _format_env_line(key, value))
+    _load_env_values.cache_clear()
 
 
 def _unset_env_value(key: str) -> None:
-    env_path = _env_path()
-    if env_path.exists():
-        unset_key(str(env_path), key)
+    if _rewrite_env_key(_env_path(), key, None):
+        _load_env_values.cache_clear()
+
+
+_LOG_LEVELS = {
+    "DEBUG": logging.DEBUG,
+    "INFO": logging.INFO,
+    "WARNING": logging.WARNING,
+    "WARN": logging.WARNING,
+    "ERROR": logging.ERROR,
+    "CRITICAL": logging.CRITICAL,
+    "FATAL": logging.CRITICAL,
+}
+
+
+_logging_configured = False
 
 
 def setup_logging(level: str = "INFO"):
+    # basicConfig is a no-op once the root logger has handlers; skip the rest too.
+    global _logging_configured
+    if _logging_configured:
+        return
+    _logging_configured = True
+
+    level_value = _LOG_LEVELS.get(level.upper(), logging.INFO)
     logging.basicConfig(
-        level=getattr(logging, level.upper(), logging.INFO),
+        level=level_value,
         format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
         handlers=[
             logging.StreamHandler(),
         ],
     )
-    # Avoid leaking secrets like Discord webhook tokens via HTTP request logs.
-    logging.getLogger("httpx").setLevel(logging.WARNING)
-    logging.getLogger("httpcore").setLevel(logging.WARNING)
+    if level_value < logging.WARNING:
+        # Avoid leaking secrets like Discord webhook tokens via HTTP request logs.
+        for name in ("httpx", "httpcore"):
+            http_logger = logging.getLogger(name)
+            if http_logger.getEffectiveLevel() < logging.WARNING:
+                http_logger.setLevel(logging.WARNING)
 
 
-def _build_parser() -> argparse.ArgumentParser:
-    parser = argparse.ArgumentParser(prog="teleforward")
-    sub = parser.add_subparsers(dest="cmd")
-    sub.add_parser("tui", help="Run interactive terminal UI (default)")
-    sub.add_parser("run", help="Run headless forwarder (VPS)")
-
-    doctor_parser = sub.add_parser("doctor", help="Validate configuration")
+def _build_doctor_parser(doctor_parser: argparse.ArgumentParser) -> None:
     doctor_parser.add_argument(
         "--test-webhooks",
         action="store_true",
@@ -99,7 +294,8 @@ def _build_parser() -> argparse.ArgumentParser:
         ),
     )
 
-    config_parser = sub.add_parser("config", help="Manage env-file settings")
+
+def _build_config_parser(config_parser: argparse.ArgumentParser) -> None:
     config_sub = config_parser.add_subparsers(dest="config_cmd")
 
     config_sub.add_parser("show", help="Show editable env-file keys")
@@ -111,18 +307,45 @@ def _build_parser() -> argparse.ArgumentParser:
     config_unset = config_sub.add_parser("unset", help="Remove a key from the env file")
     config_unset.add_argument("key", choices=EDITABLE_ENV_KEYS)
 
-    migrate_parser = sub.add_parser(
-        "migrate", help="v1/v2 migration and compatibility checks"
-    )
+
+def _build_migrate_parser(migrate_parser: argparse.ArgumentParser) -> None:
     migrate_sub = migrate_parser.add_subparsers(dest="migrate_cmd")
     migrate_sub.add_parser(
         "verify-v2",
         help="Verify legacy v1 rows are mirrored into v2 destinations/routes",
     )
 
+
+_SUBCOMMANDS = (
+    ("tui", "Run interactive terminal UI (default)", None),
+    ("run", "Run headless forwarder (VPS)", None),
+    ("doctor", "Validate configuration", _build_doctor_parser),
+    ("config", "Manage env-file settings", _build_config_parser),
+    ("migrate", "v1/v2 migration and compatibility checks", _build_migrate_parser),
+)
+_SUBCOMMAND_SPECS = {name: (help_text, build) for name, help_text, build in _SUBCOMMANDS}
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """Top-level parser, used only for help and unknown-command errors."""
+    parser = argparse.ArgumentParser(prog="teleforward")
+    sub = parser.add_subparsers(dest="cmd")
+    for name, help_text, _ in _SUBCOMMANDS:
+        sub.add_parser(name, help=help_text)
     return parser
 
 
+def _parse_command_args(name: str, argv: list[str]) -> argparse.Namespace:
+    help_text, build = _SUBCOMMAND_SPECS[name]
+    if build is None and not argv:
+        # Flagless command invoked bare (the default `teleforward` path).
+        return argparse.Namespace()
+    parser = argparse.ArgumentParser(prog=f"teleforward {name}", description=help_text)
+    if build is not None:
+        build(parser)
+    return parser.parse_args(argv)
+
+
 def _run_config_command(args: argparse.Namespace) -> None:
     if not args.config_cmd:
         print("Usage: teleforward config [show|set|unset] ...")
@@ -133,11 +356,7 @@ def _run_config_command(args: argparse.Namespace) -> None:
         print(f"ENV_PATH={_env_path()}")
         for key in EDITABLE_ENV_KEYS:
             value = values.get(key)
-            if key in {
-                "TELEGRAM_API_HASH",
-                "TELEGRAM_SESSION_STRING",
-                "TELEGRAM_BOT_TOKEN",
-            }:
+            if key in SECRET_ENV_KEYS:
                 shown = _mask_secret(value)
             else:
                 shown = value or "(unset)"
@@ -157,6 +376,25 @@ def _run_config_command(args: argparse.Namespace) -> None:
     print("Unknown config subcommand.")
 
 
+_VERIFY_V2_TOTALS = (
+    ("LEGACY_WEBHOOKS_TOTAL", "legacy_webhooks_total"),
+    ("MIRRORED_DESTINATIONS_TOTAL", "mirrored_destinations_total"),
+    ("LEGACY_MAPPINGS_TOTAL", "legacy_mappings_total"),
+    ("MIRRORED_ROUTES_TOTAL", "mirrored_routes_total"),
+    ("LEGACY_TRANSFORM_RULES_LINKED_TOTAL", "legacy_transform_rules_linked_total"),
+)
+_VERIFY_V2_FAILURES = (
+    ("missing_webhook_ids", "missing webhook mirrors"),
+    ("missing_mapping_ids", "missing route mirrors"),
+    ("orphaned_webhook_mirror_ids", "orphaned destination_discord legacy refs"),
+    ("orphaned_mapping_mirror_ids", "orphaned route_mappings legacy refs"),
+    (
+        "unmatched_transform_mapping_ids",
+        "transform rules reference missing legacy mappings",
+    ),
+)
+
+
 def _run_migrate_command(args: argparse.Namespace, db) -> None:
     if not args.migrate_cmd:
         print("Usage: teleforward migrate verify-v2")
@@ -164,74 +402,36 @@ def _run_migrate_command(args: argparse.Namespace, db) -> None:
 
     if args.migrate_cmd == "verify-v2":
         report = db.get_legacy_migration_report()
-        print("LEGACY_POLICY=compat_history_frozen")
-        print(
+        lines = [
+            "LEGACY_POLICY=compat_history_frozen",
             "LEGACY_RETIREMENT_NOTE=v1 tables stay as compatibility history in v2.0; "
-            "no destructive drop command is provided."
+            "no destructive drop command is provided.",
+        ]
+        lines.extend(
+            f"{label}={report[key]}" for label, key in _VERIFY_V2_TOTALS
         )
-        print(f"LEGACY_WEBHOOKS_TOTAL={report['legacy_webhooks_total']}")
-        print(f"MIRRORED_DESTINATIONS_TOTAL={report['mirrored_destinations_total']}")
-        print(f"LEGACY_MAPPINGS_TOTAL={report['legacy_mappings_total']}")
-        print(f"MIRRORED_ROUTES_TOTAL={report['mirrored_routes_total']}")
-        print(
-            "LEGACY_TRANSFORM_RULES_LINKED_TOTAL="
-            f"{report['legacy_transform_rules_linked_total']}"
-        )
-
-        failures: list[str] = []
-        if report["missing_webhook_ids"]:
-            failures.append(f"missing webhook mirrors: {report['missing_webhook_ids']}")
-        if report["missing_mapping_ids"]:
-            failures.append(f"missing route mirrors: {report['missing_mapping_ids']}")
-        if report["orphaned_webhook_mirror_ids"]:
-            failures.append(
-                "orphaned destination_discord legacy refs: "
-                f"{report['orphaned_webhook_mirror_ids']}"
-            )
-        if report["orphaned_mapping_mirror_ids"]:
-            failures.append(
-                "orphaned route_mappings legacy refs: "
-                f"{report['orphaned_mapping_mirror_ids']}"
-            )
-        if report["unmatched_transform_mapping_ids"]:
-            failures.append(
-                "transform rules reference missing legacy mappings: "
-                f"{report['unmatched_transform_mapping_ids']}"
-            )
+        failures = [
+            f"{description}: {ids}"
+            for key, description in _VERIFY_V2_FAILURES
+            if (ids := report.get(key))
+        ]
 
         if failures:
-            print("VERIFY_V2=FAILED")
-            for item in failures:
-                print(f"  - {item}")
+            lines.append("VERIFY_V2=FAILED")
+            lines.extend(f"  - {item}" for item in failures)
+            print("\n".join(lines))
             sys.exit(1)
 
-        print("VERIFY_V2=OK")
+        lines.append("VERIFY_V2=OK")
+        print("\n".join(lines))
         return
 
     print("Unknown migrate subcommand.")
 
 
-def main():
-    parser = _build_parser()
-    args = parser.parse_args(sys.argv[1:])
-    cmd = args.cmd or "tui"
-
-    if cmd == "config":
-        _run_config_command(args)
-        return
-    if cmd == "migrate":
-        from database.db import Database
-
-        raw_env = _load_env_values()
-        database_path = raw_env.get("DATABASE_PATH")
-        db = Database(database_path=database_path)
-        _run_migrate_command(args, db)
-        return
-
+def _load_config():
+    """Load config and set up logging for tui/run/doctor; exits if it is incomplete."""
     from config import get_config
-    from database.db import Database
-    from tui.app import run_tui, run_headless
-    import asyncio
 
     try:
         config = get_config()
@@ -244,176 +444,289 @@ def main():
         print("  teleforward config show")
         print("  teleforward config set TELEGRAM_API_ID 12345")
         print("  teleforward config set TELEGRAM_API_HASH your_hash")
+        print(f"\nENV_PATH={_env_path()}")
         sys.exit(1)
 
     config.ensure_directories()
     setup_logging(config.log_level)
+    return config
 
-    db = Database(database_path=config.database_path)
 
-    if cmd == "tui":
-        try:
-            asyncio.run(run_tui(config=config, db=db))
-        except KeyboardInterrupt:
-            print("\nExiting.")
-        return
-    if cmd == "run":
-        try:
-            asyncio.run(run_headless(config=config, db=db))
-        except KeyboardInterrupt:
-            print("\nStopped.")
-        return
-    if cmd == "doctor":
-        from core.discord_sender import DiscordWebhookSender
-        from core.telegram_client import TelegramClientWrapper
-        from database.models import DestinationType
+def _open_database(config):
+    from database.db import Database
 
-        errors: list[str] = []
-        warnings: list[str] = []
+    return Database(database_path=config.database_path)
 
-        session_string = (
-            config.telegram_session_string
-            if config.telegram_session_string is not None
-            else db.get_setting("telegram_session_string")
-        )
-        session_from_db = db.get_setting("telegram_session_string")
-        session_source = (
-            "env"
-            if config.telegram_session_string is not None
-            else ("db" if session_from_db else "none")
-        )
 
-        print(f"DATABASE_PATH={config.database_path}")
-        print(f"DATA_DIR={config.resolve_data_dir()}")
-        print(f"ENV_PATH={_env_path()}")
-        print(f"TELEGRAM_SESSION_SOURCE={session_source}")
-
-        if getattr(args, "sync_session_to_env", False):
-            if config.telegram_session_string is None and session_from_db:
-                _set_env_value("TELEGRAM_SESSION_STRING", session_from_db)
-                print("Synced TELEGRAM_SESSION_STRING from database to env file")
-            elif config.telegram_session_string is not None:
-                print("Skipped sync: TELEGRAM_SESSION_STRING already set in env file")
-            else:
-                print("Skipped sync: no TELEGRAM_SESSION_STRING found in db or env file")
+def _cmd_tui(argv: list[str]) -> None:
+    _parse_command_args("tui", argv)
+    config = _load_config()
+    db = _open_database(config)
+    import asyncio
+    from tui.app import run_tui
 
-        if not session_string:
-            warnings.append(
-                "No Telegram session found. Run `python main.py tui` -> 'Login' to save one, "
-                "or set TELEGRAM_SESSION_STRING."
-            )
+    try:
+        asyncio.run(run_tui(config=config, db=db))
+    except KeyboardInterrupt:
+        print("\nExiting.")
 
-        channels = db.get_telegram_channels(active_only=True)
-        destination_rows = db.get_destination_rows(active_only=True)
-        route_rows = db.get_route_rows(active_only=True)
 
-        print(f"ACTIVE_SOURCES={len(channels)}")
-        print(f"ACTIVE_CHANNELS={len(channels)}")
-        print(f"ACTIVE_DESTINATIONS={len(destination_rows)}")
-        print(f"ACTIVE_ROUTES={len(route_rows)}")
+def _cmd_run(argv: list[str]) -> None:
+    _parse_command_args("run", argv)
+    config = _load_config()
+    db = _open_database(config)
+    import asyncio
+    from tui.app import run_headless
 
-        if not channels:
-            warnings.append("No active Telegram channels saved.")
-        if not destination_rows:
-            warnings.append("No active destinations saved.")
-        if not route_rows:
-            warnings.append("No active route mappings saved.")
+    try:
+        asyncio.run(run_headless(config=config, db=db))
+    except KeyboardInterrupt:
+        print("\nStopped.")
 
-        sender = DiscordWebhookSender()
-        for route in route_rows:
-            destination_type = route.get("destination_type")
-            destination_name = route.get("destination_name") or str(
-                route.get("destination_id")
-            )
-            if destination_type == DestinationType.DISCORD_WEBHOOK.value:
-                webhook_url = route.get("discord_webhook_url")
-                if not webhook_url or not sender.is_discord_webhook_url(webhook_url):
-                    errors.append(
-                        f"Route destination '{destination_name}' has invalid Discord webhook URL."
-                    )
-            elif destination_type == DestinationType.TELEGRAM_CHAT.value:
-                if route.get("telegram_chat_id") is None:
-                    errors.append(
-                        f"Route destination '{destination_name}' missing telegram_chat_id."
-                    )
 
-        if getattr(args, "test_webhooks", False):
-            discord_webhooks = sorted(
-                {
-                    str(row["discord_webhook_url"])
-                    for row in destination_rows
-                    if row.get("destination_type") == DestinationType.DISCORD_WEBHOOK.value
-                    and row.get("discord_webhook_url")
-                }
-            )
-            if not discord_webhooks:
-                warnings.append("No Discord destinations found to test.")
-
-            async def _test_all():
-                for webhook_url in discord_webhooks:
-                    ok, why = await sender.test_webhook(webhook_url)
-                    if not ok:
-                        errors.append(f"Discord destination webhook test failed: {why}")
-                await sender.close()
+def _cmd_config(argv: list[str]) -> None:
+    _run_config_command(_parse_command_args("config", argv))
 
-            asyncio.run(_test_all())
 
-        if getattr(args, "test_telegram_destinations", False):
-            telegram_targets = sorted(
-                {
-                    int(r["telegram_chat_id"])
-                    for r in route_rows
-                    if r.get("destination_type") == DestinationType.TELEGRAM_CHAT.value
-                    and r.get("telegram_chat_id") is not None
-                }
-            )
-            if not telegram_targets:
-                warnings.append("No Telegram destinations found to test.")
-            elif not session_string:
+def _cmd_migrate(argv: list[str]) -> None:
+    args = _parse_command_args("migrate", argv)
+    from database.db import Database
+
+    database_path = _get_env_value("DATABASE_PATH")
+    db = Database(database_path=database_path)
+    _run_migrate_command(args, db)
+
+
+def _cmd_doctor(argv: list[str]) -> None:
+    args = _parse_command_args("doctor", argv)
+    # A missing API id/hash exits here, before the database is opened or migrated.
+    config = _load_config()
+    import asyncio
+
+    from database.models import DestinationType
+
+    errors: list[str] = []
+    warnings: list[str] = []
+
+    snapshot = _open_database(config).doctor_snapshot()
+    session_from_env = config.telegram_session_string
+    session_from_db = snapshot.session_string
+    if session_from_env is not None:
+        session_string, session_source = session_from_env, "env"
+    else:
+        session_string = session_from_db
+        session_source = "db" if session_from_db else "none"
+
+    print(f"DATABASE_PATH={config.database_path}")
+    print(f"DATA_DIR={config.resolve_data_dir()}")
+    print(f"ENV_PATH={_env_path()}")
+    print(f"TELEGRAM_SESSION_SOURCE={session_source}")
+
+    if getattr(args, "sync_session_to_env", False):
+        if session_from_env is None and session_from_db:
+            _set_env_value("TELEGRAM_SESSION_STRING", session_from_db)
+            print("Synced TELEGRAM_SESSION_STRING from database to env file")
+        elif session_from_env is not None:
+            print("Skipped sync: TELEGRAM_SESSION_STRING already set in env file")
+        else:
+            print("Skipped sync: no TELEGRAM_SESSION_STRING found in db or env file")
+
+    if not session_string:
+        warnings.append(
+            "No Telegram session found. Run `python main.py tui` -> 'Login' to save one, "
+            "or set TELEGRAM_SESSION_STRING."
+        )
+
+    channels = snapshot.channels
+    destination_rows = snapshot.destination_rows
+    route_rows = snapshot.route_rows
+
+    print(f"ACTIVE_SOURCES={len(channels)}")
+    print(f"ACTIVE_CHANNELS={len(channels)}")
+    print(f"ACTIVE_DESTINATIONS={len(destination_rows)}")
+    print(f"ACTIVE_ROUTES={len(route_rows)}")
+
+    if not channels:
+        warnings.append("No active Telegram channels saved.")
+    if not destination_rows:
+        warnings.append("No active destinations saved.")
+    if not route_rows:
+        warnings.append("No active route mappings saved.")
+
+    discord_type = DestinationType.DISCORD_WEBHOOK.value
+    telegram_type = DestinationType.TELEGRAM_CHAT.value
+    test_webhooks = getattr(args, "test_webhooks", False)
+    is_webhook_url = None
+    # One pass validates every route and collects the Telegram targets.
+    telegram_chat_ids: set[int] = set()
+    # Route rows always carry every column; pull the five used here in one C call.
+    route_fields = itemgetter(
+        "destination_type",
+        "destination_name",
+        "destination_id",
+        "discord_webhook_url",
+        "telegram_chat_id",
+    )
+    for (
+        destination_type,
+        destination_name,
+        destination_id,
+        webhook_url,
+        chat_id,
+    ) in map(route_fields, route_rows):
+        destination_name = destination_name or str(destination_id)
+        if destination_type == discord_type:
+            if is_webhook_url is None:
+                from core.discord_sender import DiscordWebhookSender
+
+                is_webhook_url = DiscordWebhookSender.is_discord_webhook_url
+            if not webhook_url or not is_webhook_url(webhook_url):
+                errors.append(
+                    f"Route destination '{destination_name}' has invalid Discord webhook URL."
+                )
+        elif destination_type == telegram_type:
+            if chat_id is None:
                 errors.append(
-                    "Cannot test Telegram destinations: no TELEGRAM_SESSION_STRING available."
+                    f"Route destination '{destination_name}' missing telegram_chat_id."
                 )
             else:
-                async def _test_telegram_destinations():
-                    telegram = TelegramClientWrapper(
-                        api_id=config.telegram_api_id,
-                        api_hash=config.telegram_api_hash,
-                        session_string=session_string,
-                        data_dir=config.resolve_data_dir(),
+                telegram_chat_ids.add(int(chat_id))
+
+    # Network probes run together on one event loop at the end.
+    network_checks = []
+
+    if test_webhooks:
+        from core.discord_sender import DiscordWebhookSender
+
+        sender = DiscordWebhookSender()
+        discord_webhooks = sorted(
+            {
+                str(row["discord_webhook_url"])
+                for row in destination_rows
+                if row.get("destination_type") == discord_type
+                and row.get("discord_webhook_url")
+            }
+        )
+        if not discord_webhooks:
+            warnings.append("No Discord destinations found to test.")
+
+        async def _test_all():
+            # Probes are independent round-trips; run them concurrently but
+            # cap in-flight requests to stay clear of Discord rate limits.
+            semaphore = asyncio.Semaphore(10)
+
+            async def _probe(webhook_url: str):
+                async with semaphore:
+                    return await sender.test_webhook(webhook_url)
+
+            try:
+                results = await asyncio.gather(
+                    *(_probe(url) for url in discord_webhooks),
+                    return_exceptions=True,
+                )
+            finally:
+                await sender.close()
+            for result in results:
+                if isinstance(result, BaseException):
+                    errors.append(f"Discord destination webhook test failed: {result}")
+                    continue
+                ok, why = result
+                if not ok:
+                    errors.append(f"Discord destination webhook test failed: {why}")
+
+        network_checks.append(_test_all)
+
+    if getattr(args, "test_telegram_destinations", False):
+        telegram_targets = sorted(telegram_chat_ids)
+        if not telegram_targets:
+            warnings.append("No Telegram destinations found to test.")
+        elif not session_string:
+            errors.append(
+                "Cannot test Telegram destinations: no TELEGRAM_SESSION_STRING available."
+            )
+        else:
+            from core.telegram_client import TelegramClientWrapper
+
+            async def _test_telegram_destinations():
+                telegram = TelegramClientWrapper(
+                    api_id=config.telegram_api_id,
+                    api_hash=config.telegram_api_hash,
+                    session_string=session_string,
+                    data_dir=config.resolve_data_dir(),
+                )
+                try:
+                    await telegram.start(phone=None)
+                    # Resolve all targets concurrently over the one client.
+                    semaphore = asyncio.Semaphore(8)
+
+                    async def _lookup(chat_id: int):
+                        async with semaphore:
+                            return await telegram.get_channel_info(chat_id)
+
+                    results = await asyncio.gather(
+                        *(_lookup(chat_id) for chat_id in telegram_targets),
+                        return_exceptions=True,
                     )
+                    for chat_id, info in zip(telegram_targets, results):
+                        if isinstance(info, BaseException) or not info:
+                            errors.append(
+                                f"Telegram destination chat_id={chat_id} not reachable."
+                            )
+                except Exception as e:
+                    errors.append(f"Telegram destination test failed: {e}")
+                finally:
                     try:
-                        await telegram.start(phone=None)
-                        for chat_id in telegram_targets:
-                            info = await telegram.get_channel_info(chat_id)
-                            if not info:
-                                errors.append(
-                                    f"Telegram destination chat_id={chat_id} not reachable."
-                                )
-                    except Exception as e:
-                        errors.append(f"Telegram destination test failed: {e}")
-                    finally:
-                        try:
-                            await telegram.stop()
-                        except Exception:
-                            pass
-
-                asyncio.run(_test_telegram_destinations())
-
-        if warnings:
-            print("Warnings:")
-            for w in warnings:
-                print(f"  - {w}")
-        if errors:
-            print("Errors:")
-            for e in errors:
-                print(f"  - {e}")
-            sys.exit(1)
+                        await telegram.stop()
+                    except Exception:
+                        pass
+
+            network_checks.append(_test_telegram_destinations)
+
+    if network_checks:
+
+        async def _run_network_checks():
+            await asyncio.gather(*(check() for check in network_checks))
+
+        asyncio.run(_run_network_checks())
+
+    lines: list[str] = []
+    if warnings:
+        lines.append("Warnings:")
+        lines.extend(f"  - {w}" for w in warnings)
+    if errors:
+        lines.append("Errors:")
+        lines.extend(f"  - {e}" for e in errors)
+        print("\n".join(lines))
+        sys.exit(1)
+
+    lines.append("OK: configuration looks good.")
+    print("\n".join(lines))
+
+
+_COMMANDS = {
+    "tui": _cmd_tui,
+    "run": _cmd_run,
+    "doctor": _cmd_doctor,
+    "config": _cmd_config,
+    "migrate": _cmd_migrate,
+}
+
+
+def main():
+    argv = sys.argv[1:]
+    if not argv:
+        _cmd_tui([])
+        return
 
-        print("OK: configuration looks good.")
+    command = _COMMANDS.get(argv[0])
+    if command is not None:
+        # Only the chosen command's own parser is built.
+        command(argv[1:])
         return
 
-    parser.print_help()
-    sys.exit(2)
+    # -h/--help, unknown commands and stray options: argparse prints usage and exits.
+    args = _build_parser().parse_args(argv)
+    _COMMANDS[args.cmd or "tui"]([])
 
 
 if __name__ == "__main__":
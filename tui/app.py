@@ -1,20 +1,24 @@
 import asyncio
+import codecs
 import logging
 import os
 import re
 import sys
+import time
+from bisect import bisect_right
+from contextlib import contextmanager, suppress
 from dataclasses import dataclass
-from getpass import getpass
-from importlib.metadata import PackageNotFoundError, version as package_version
+from functools import lru_cache
 from pathlib import Path
-from typing import Callable, Optional
-from dotenv import dotenv_values, set_key, unset_key
+from typing import Callable, Iterator, Optional
 
-from rich.console import Console, Group
+from rich.console import Console, Group, RenderableType
 from rich.columns import Columns
 from rich import box
 from rich.align import Align
+from rich.cells import cell_len
 from rich.live import Live
+from rich.markup import escape
 from rich.panel import Panel
 from rich.prompt import Prompt
 from rich.table import Table
@@ -57,6 +61,16 @@ THEME = Theme(
 
 console = Console(theme=THEME)
 
+# Shared status cells for the list tables; Rich does not mutate Text on render.
+_STATUS_ACTIVE = Text("✔ active", style="ok")
+_STATUS_DISABLED = Text("○ disabled", style="status.disabled")
+
+# List tables longer than this are printed as plain text instead of via Rich.
+FAST_TABLE_ROW_THRESHOLD = 200
+
+# Upper bound on home-menu redraws while typing (60 fps).
+_HOME_FRAME_INTERVAL = 1 / 60
+
 
 def _w() -> int:
     """Current terminal width (re-read on every call)."""
@@ -69,6 +83,13 @@ def _feedback(
     title: str | None = None,
 ) -> Panel:
     """Compact one-liner panel that doesn't stretch to full terminal width."""
+    return _feedback_panel(msg, title)
+
+
+@lru_cache(maxsize=128)
+def _feedback_panel(msg: str, title: str | None) -> Panel:
+    # Most feedback is a handful of canned strings; Rich does not mutate a
+    # Panel when printing it, so one instance per message can be reused.
     return Panel.fit(
         msg,
         title=title,
@@ -77,113 +98,239 @@ def _feedback(
     )
 
 
-async def _read_home_choice_live(render_home: Callable[[str], Panel]) -> str:
-    """Live-updating menu input for the home screen."""
-    if not sys.stdin.isatty():
-        return Prompt.ask("Select (0-18, q=exit)", default="").strip()
+@contextmanager
+def _synchronized_output() -> Iterator[None]:
+    """Bracket terminal writes in a synchronized-output frame (DEC mode 2026).
+
+    Terminals that support the mode paint the whole frame at once instead of
+    showing it half-drawn; others ignore the escape sequences.
+    """
+    if not console.is_terminal:
+        yield
+        return
+    console.file.write("\x1b[?2026h")
+    try:
+        yield
+    finally:
+        console.file.write("\x1b[?2026l")
+        console.file.flush()
+
+
+def _update_live_frame(live: Live, renderable: RenderableType) -> None:
+    """Redraw a Live region as one synchronized frame."""
+    with _synchronized_output():
+        live.update(renderable, refresh=True)
+
+
+def _print_table(table: Table, *after: RenderableType) -> None:
+    """Print a list table, dropping to plain aligned text for very long lists.
+
+    Rich lays out every cell of every row; past FAST_TABLE_ROW_THRESHOLD rows
+    that dominates the screen time, so large listings skip it. Renderables in
+    ``after`` are printed below the table in the same console write.
+    """
+    if table.row_count <= FAST_TABLE_ROW_THRESHOLD:
+        console.print(Group(table, *after) if after else table)
+        return
+    _render_table_fast(
+        [str(col.header) for col in table.columns],
+        list(zip(*(col.cells for col in table.columns))),
+        title=str(table.title or ""),
+    )
+    if after:
+        console.print(Group(*after))
+
+
+def _render_table_fast(
+    headers: list[str],
+    rows: list[tuple],
+    *,
+    title: str = "",
+) -> None:
+    cells = [
+        [c.plain if isinstance(c, Text) else str(c) for c in row] for row in rows
+    ]
+    widths = [cell_len(h) for h in headers]
+    for row in cells:
+        for i, c in enumerate(row):
+            n = cell_len(c)
+            if n > widths[i]:
+                widths[i] = n
+
+    def fmt(row: list[str]) -> str:
+        return "  ".join(
+            c + " " * (w - cell_len(c)) for c, w in zip(row, widths)
+        ).rstrip()
+
+    lines = [title] if title else []
+    lines.append(fmt(headers))
+    lines.append("  ".join("-" * w for w in widths))
+    lines.extend(fmt(row) for row in cells)
+    console.file.write("\n".join(lines) + "\n")
+    console.file.flush()
+
+
+async def _read_line_live(live: Live, render: Callable[[str], RenderableType]) -> str:
+    """Read one line from the terminal, redrawing ``live`` as it is typed.
+
+    ``render`` gets the text typed so far. Returns "q" on a bare ESC or when
+    stdin hangs up.
+    """
+    loop = asyncio.get_running_loop()
+    # Decoded keystrokes; None asks for a redraw (resize), "" means stdin hung up.
+    keys: asyncio.Queue[Optional[str]] = asyncio.Queue()
 
     if os.name == "nt":
         import msvcrt
+        import threading
+
+        stop_reading = threading.Event()
+
+        def _pump_keys() -> None:
+            # Polls the console off the event loop; the loop only wakes when
+            # a key arrives or the window is resized.
+            size = os.get_terminal_size()
+            while not stop_reading.is_set():
+                if not msvcrt.kbhit():
+                    new_size = os.get_terminal_size()
+                    if new_size != size:
+                        size = new_size
+                        loop.call_soon_threadsafe(keys.put_nowait, None)
+                    stop_reading.wait(0.05)
+                    continue
+                ch = msvcrt.getwch()
+                # Extended keys (arrows/function keys): ignore payload char.
+                if ch in {"\x00", "\xe0"}:
+                    if msvcrt.kbhit():
+                        _ = msvcrt.getwch()
+                    continue
+                loop.call_soon_threadsafe(keys.put_nowait, ch)
 
-        typed = ""
-        with Live(
-            Align.center(render_home(typed)),
-            console=console,
-            refresh_per_second=20,
-            auto_refresh=False,
-        ) as live:
-            while True:
-                live.update(Align.center(render_home(typed)), refresh=True)
+        key_reader = threading.Thread(target=_pump_keys, daemon=True)
 
-                while msvcrt.kbhit():
-                    ch = msvcrt.getwch()
+        def _start_input() -> None:
+            key_reader.start()
 
-                    # Extended keys (arrows/function keys): ignore payload char.
-                    if ch in {"\x00", "\xe0"}:
-                        if msvcrt.kbhit():
-                            _ = msvcrt.getwch()
-                        continue
+        def _stop_input() -> None:
+            stop_reading.set()
+            if key_reader.is_alive():
+                key_reader.join()
 
-                    if ch == "\x03":
-                        raise KeyboardInterrupt
-                    if ch in {"\r", "\n"}:
-                        return typed.strip()
-                    if ch == "\x1b":
-                        return "q"
-                    if ch in {"\b", "\x7f"}:
-                        typed = typed[:-1]
-                        continue
-                    if ch.isprintable():
-                        typed += ch
+    else:
+        import signal
+        import termios
+        import tty
+
+        fd = sys.stdin.fileno()
+        old_settings = termios.tcgetattr(fd)
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+
+        def _on_stdin() -> None:
+            data = os.read(fd, 4096)
+            if not data:
+                loop.remove_reader(fd)
+                keys.put_nowait("")
+                return
+            for ch in decoder.decode(data):
+                keys.put_nowait(ch)
+
+        def _start_input() -> None:
+            tty.setcbreak(fd)
+            loop.add_reader(fd, _on_stdin)
+            loop.add_signal_handler(signal.SIGWINCH, keys.put_nowait, None)
+
+        def _stop_input() -> None:
+            loop.remove_signal_handler(signal.SIGWINCH)
+            loop.remove_reader(fd)
+            termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
+
+    typed: list[str] = []
+    try:
+        _start_input()
+        dirty = False
+        last_render = time.monotonic()
+        while True:
+            # Redraw only after the input changed and every key already read
+            # (e.g. a paste) has been applied, at most once per frame.
+            timeout = None
+            if dirty and keys.empty():
+                timeout = last_render + _HOME_FRAME_INTERVAL - time.monotonic()
+                if timeout <= 0:
+                    _update_live_frame(live, render("".join(typed)))
+                    last_render = time.monotonic()
+                    dirty = False
+                    timeout = None
+            try:
+                ch = await asyncio.wait_for(keys.get(), timeout)
+            except asyncio.TimeoutError:
+                continue
+            if ch == "":
+                return "q"
+            if ch == "\x03":
+                raise KeyboardInterrupt
+            if ch in {"\r", "\n"}:
+                return "".join(typed).strip()
+            if ch == "\x1b":
+                # Bare ESC quits; arrow/function escape sequences are ignored.
+                try:
+                    seq_head = await asyncio.wait_for(keys.get(), 0.01)
+                except asyncio.TimeoutError:
+                    return "q"
+                if seq_head == "":
+                    return "q"
+                if seq_head == "[":
+                    while not keys.empty():
+                        seq_ch = keys.get_nowait()
+                        if seq_ch and (seq_ch.isalpha() or seq_ch == "~"):
+                            break
+                continue
+            if ch is None:
+                dirty = True
+            elif ch in {"\b", "\x7f"}:
+                if typed:
+                    typed.pop()
+                    dirty = True
+            elif ch.isprintable():
+                typed.append(ch)
+                dirty = True
+    finally:
+        _stop_input()
 
-                await asyncio.sleep(0.05)
 
-    import select
-    import termios
-    import tty
+async def _read_home_choice_live(render_home: Callable[[str], Panel]) -> str:
+    """Live-updating menu input for the home screen."""
+    if not sys.stdin.isatty():
+        return Prompt.ask("Select (0-18, q=exit)", default="").strip()
 
-    typed = ""
-    fd = sys.stdin.fileno()
-    old_settings = termios.tcgetattr(fd)
     with Live(
-        Align.center(render_home(typed)),
+        Align.center(render_home("")),
         console=console,
-        refresh_per_second=20,
         auto_refresh=False,
+        screen=True,
     ) as live:
-        try:
-            tty.setcbreak(fd)
-            while True:
-                live.update(Align.center(render_home(typed)), refresh=True)
-
-                ready, _, _ = select.select([fd], [], [], 0)
-                if ready:
-                    ch = sys.stdin.read(1)
-                    if ch == "\x03":
-                        raise KeyboardInterrupt
-                    if ch in {"\r", "\n"}:
-                        return typed.strip()
-                    if ch == "\x1b":
-                        # Bare ESC quits; arrow/function escape sequences are ignored.
-                        next_ready, _, _ = select.select([fd], [], [], 0.01)
-                        if not next_ready:
-                            return "q"
-                        seq_head = sys.stdin.read(1)
-                        if seq_head == "[":
-                            while True:
-                                seq_ready, _, _ = select.select([fd], [], [], 0)
-                                if not seq_ready:
-                                    break
-                                seq_ch = sys.stdin.read(1)
-                                if seq_ch.isalpha() or seq_ch == "~":
-                                    break
-                            continue
-                        continue
-                    if ch in {"\b", "\x7f"}:
-                        typed = typed[:-1]
-                        continue
-                    if ch.isprintable():
-                        typed += ch
-
-                await asyncio.sleep(0.05)
-        finally:
-            termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
+        return await _read_line_live(live, lambda typed: Align.center(render_home(typed)))
 
 
 class CancelAction(Exception):
     pass
 
 
+_PYPROJECT_VERSION_RE = re.compile(r'(?m)^version\s*=\s*"([^"]+)"\s*$')
+
+
+@lru_cache(maxsize=1)
 def _app_version() -> str:
     pyproject = Path(__file__).resolve().parent.parent / "pyproject.toml"
     try:
         text = pyproject.read_text(encoding="utf-8")
-        match = re.search(r'(?m)^version\s*=\s*"([^"]+)"\s*$', text)
+        match = _PYPROJECT_VERSION_RE.search(text)
         if match:
             return match.group(1)
     except Exception:
         pass
 
+    from importlib.metadata import PackageNotFoundError, version as package_version
+
     try:
         return package_version("teleforward")
     except PackageNotFoundError:
@@ -216,10 +363,10 @@ def _prompt_int(prompt: str) -> int:
             raise
         if raw.lower() in {"q", "quit", "cancel"}:
             raise CancelAction()
-        try:
+        digits = raw[1:] if raw.startswith(("-", "+")) else raw
+        if digits.isdecimal():
             return int(raw)
-        except ValueError:
-            console.print(_feedback("[warn]?[/warn] Please enter a valid integer."))
+        console.print(_feedback("[warn]?[/warn] Please enter a valid integer."))
 
 def _choose_index(prompt: str, max_index: int) -> int:
     while True:
@@ -229,11 +376,10 @@ def _choose_index(prompt: str, max_index: int) -> int:
             raise
         if raw.lower() in {"q", "quit", "cancel"}:
             raise CancelAction()
-        try:
-            idx = int(raw)
-        except ValueError:
+        if not raw.isdecimal():
             console.print(_feedback("[warn]⚠[/warn] Please enter a number."))
             continue
+        idx = int(raw)
         if 1 <= idx <= max_index:
             return idx
         console.print(
@@ -243,6 +389,20 @@ def _choose_index(prompt: str, max_index: int) -> int:
         )
 
 
+# A comma-separated list of plain numbers (empty items allowed, e.g. "1,,3,").
+_INDEX_LIST_RE = re.compile(r"\s*(?:\d+\s*)?(?:,\s*(?:\d+\s*)?)*")
+_INDEX_RE = re.compile(r"\d+")
+
+
+def _parse_index_list(raw: str) -> list[int]:
+    """Parse "1, 3,5" into sorted unique ints; raises ValueError otherwise."""
+    if _INDEX_LIST_RE.fullmatch(raw):
+        return sorted({int(n) for n in _INDEX_RE.findall(raw)})
+    # Anything else (signs, stray text) goes through int() for its verdict.
+    parts = [p.strip() for p in raw.split(",") if p.strip()]
+    return sorted({int(p) for p in parts})
+
+
 def _choose_many_indexes(prompt: str, max_index: int) -> list[int]:
     while True:
         try:
@@ -253,9 +413,8 @@ def _choose_many_indexes(prompt: str, max_index: int) -> list[int]:
             return list(range(1, max_index + 1))
         if raw.lower() in {"q", "quit", "cancel"}:
             raise CancelAction()
-        parts = [p.strip() for p in raw.split(",") if p.strip()]
         try:
-            idxs = sorted({int(p) for p in parts})
+            idxs = _parse_index_list(raw)
         except ValueError:
             console.print(
                 _feedback(
@@ -281,6 +440,7 @@ class TuiContext:
     telegram: TelegramClientWrapper
     telegram_destination_sender: TelegramDestinationSender
     env_path: Path
+    session_save_task: Optional[asyncio.Task] = None
 
 
 def _make_telegram_destination_sender(config: Config) -> TelegramDestinationSender:
@@ -294,6 +454,17 @@ def _make_telegram_destination_sender(config: Config) -> TelegramDestinationSend
     )
 
 
+def _save_session_in_background(ctx: TuiContext) -> None:
+    if ctx.session_save_task is not None and not ctx.session_save_task.done():
+        return
+    session = ctx.telegram.export_session_string()
+    if not session:
+        return
+    ctx.session_save_task = asyncio.create_task(
+        asyncio.to_thread(ctx.db.set_setting, "telegram_session_string", session)
+    )
+
+
 async def _ensure_telegram_connected(ctx: TuiContext, interactive: bool) -> bool:
     try:
         await ctx.telegram.start(
@@ -302,10 +473,9 @@ async def _ensure_telegram_connected(ctx: TuiContext, interactive: bool) -> bool
             password_callback=None,
         )
         # If the session was created as a file session, proactively export it and
-        # store it in the DB so headless runs can use it.
-        session = ctx.telegram.export_session_string()
-        if session:
-            ctx.db.set_setting("telegram_session_string", session)
+        # store it in the DB so headless runs can use it. The write runs in the
+        # background so the caller can move on right away.
+        _save_session_in_background(ctx)
         return True
     except ValueError:
         if not interactive:
@@ -318,6 +488,8 @@ async def _ensure_telegram_connected(ctx: TuiContext, interactive: bool) -> bool
         return _prompt("Telegram login code")
 
     async def password_callback() -> str:
+        from getpass import getpass
+
         return getpass("Telegram 2FA password (if enabled): ")
 
     await ctx.telegram.start(
@@ -357,11 +529,7 @@ def _print_channels(ctx: TuiContext) -> None:
     table.add_column("Status", no_wrap=True)
     membership_map = ctx.db.get_source_group_membership_map(active_only=False)
     for i, ch in enumerate(channels, start=1):
-        status = (
-            Text("✔ active", style="ok")
-            if ch.is_active
-            else Text("○ disabled", style="status.disabled")
-        )
+        status = _STATUS_ACTIVE if ch.is_active else _STATUS_DISABLED
         table.add_row(
             str(i),
             ch.name,
@@ -390,11 +558,7 @@ def _print_webhooks(ctx: TuiContext) -> None:
     table.add_column("Name", style="heading", ratio=1, overflow="fold")
     table.add_column("Status", no_wrap=True)
     for i, wh in enumerate(webhooks, start=1):
-        status = (
-            Text("✔ active", style="ok")
-            if wh.is_active
-            else Text("○ disabled", style="status.disabled")
-        )
+        status = _STATUS_ACTIVE if wh.is_active else _STATUS_DISABLED
         table.add_row(str(i), wh.name, status)
     console.print(table)
 
@@ -466,14 +630,40 @@ async def _export_telegram_session(ctx: TuiContext) -> None:
         console.print(_feedback("[info]●[/info] Not revealed."))
         return
 
+    # Built directly rather than via _feedback so the secret is not kept in
+    # the feedback panel cache.
     console.print(
-        _feedback(
+        Panel.fit(
             f"TELEGRAM_SESSION_STRING={session}",
             title="Copy into /etc/teleforward/teleforward.env",
+            border_style="bright_black",
+            padding=(0, 1),
         )
     )
 
 
+_DIALOG_COLS: tuple[tuple[str, dict], ...] = (
+    ("#", {"style": "key", "no_wrap": True, "width": 4}),
+    ("Sel", {"style": "ok", "no_wrap": True, "width": 3}),
+    ("Name", {"style": "heading", "ratio": 1, "overflow": "fold"}),
+    ("Username", {"style": "dim", "ratio": 1, "overflow": "fold"}),
+    ("ID", {"style": "value", "overflow": "ellipsis", "max_width": 18}),
+    ("Type", {"style": "dim", "no_wrap": True}),
+)
+
+
+def _new_dialog_table() -> Table:
+    table = Table(
+        title="Telegram dialogs",
+        box=box.SIMPLE_HEAD,
+        show_edge=False,
+        expand=True,
+    )
+    for header, column_kwargs in _DIALOG_COLS:
+        table.add_column(header, **column_kwargs)
+    return table
+
+
 async def _import_channels(ctx: TuiContext) -> None:
     ok = await _ensure_telegram_connected(ctx, interactive=True)
     if not ok:
@@ -482,168 +672,289 @@ async def _import_channels(ctx: TuiContext) -> None:
 
     max_fetch = 10_000
     batch_size = 400
+    page_size = 20
 
     dialog_iter = ctx.telegram.iter_dialogs(limit=max_fetch)
     dialogs: list[dict] = []
     dialogs_by_id: dict[int, dict] = {}
     exhausted = False
+    # Lower-cased search text of every loaded dialog, newline-joined, with the
+    # start offset of each dialog's line, so a search is one str.find scan.
+    search_lines: list[str] = []
+    search_offsets: list[int] = []
+    search_end = 0
+    corpus = ""
+
+    # Dialogs stream in from a background task while the table is on screen.
+    # It keeps one batch loaded past what the UI asked for, then idles until
+    # fetch_more raises the target.
+    wanted = batch_size
+    demand = asyncio.Event()
+    progress = asyncio.Event()
+    fetch_error: Optional[Exception] = None
+
+    async def prefetch() -> None:
+        nonlocal exhausted, search_end, fetch_error
+        try:
+            async for d in dialog_iter:
+                # Search text is fixed per dialog, so build it once here.
+                hay = " ".join(
+                    [
+                        str(d.get("name", "")),
+                        str(d.get("username", "")),
+                        str(d.get("id", "")),
+                        str(d.get("type", "")),
+                    ]
+                ).lower()
+                search_offsets.append(search_end)
+                search_lines.append(hay)
+                search_end += len(hay) + 1
+                dialogs.append(d)
+                dialogs_by_id[d["id"]] = d
+                progress.set()
+                while len(dialogs) >= wanted + batch_size:
+                    demand.clear()
+                    await demand.wait()
+        except Exception as e:
+            fetch_error = e
+        finally:
+            exhausted = True
+            progress.set()
+            await dialog_iter.aclose()
 
     async def fetch_more(target_total: int) -> None:
-        nonlocal exhausted
-        if exhausted:
+        nonlocal wanted
+        wanted = max(wanted, target_total)
+        demand.set()
+        while len(dialogs) < target_total and not exhausted:
+            progress.clear()
+            await progress.wait()
+        if fetch_error is not None:
+            raise fetch_error
+
+    prefetch_task = asyncio.create_task(prefetch())
+    try:
+        await fetch_more(page_size)
+        if not dialogs:
+            console.print(_feedback("[warn]⚠[/warn] No dialogs found."))
             return
-        while len(dialogs) < target_total:
-            try:
-                d = await dialog_iter.__anext__()  # type: ignore[attr-defined]
-            except StopAsyncIteration:
-                exhausted = True
-                break
-            dialogs.append(d)
-            dialogs_by_id[d["id"]] = d
-
-    await fetch_more(batch_size)
-    if not dialogs:
-        console.print(_feedback("[warn]⚠[/warn] No dialogs found."))
-        return
-    selected_ids: set[int] = set()
-    query = ""
-    page = 0
-    page_size = 20
-
-    def apply_filter() -> list[dict]:
-        if not query:
-            return dialogs
-        out = []
-        q = query.lower()
-        for d in dialogs:
-            hay = " ".join(
-                [
-                    str(d.get("name", "")),
-                    str(d.get("username", "")),
-                    str(d.get("id", "")),
-                    str(d.get("type", "")),
-                ]
-            ).lower()
-            if q in hay:
-                out.append(d)
-        return out
-
-    while True:
-        console.clear()
-        loaded = len(dialogs)
-        console.print(
-            Panel.fit(
-                f"[bold]Import from Telegram[/bold]\n\n"
-                f"[dim]Loaded[/dim]=[white]{loaded}[/white]  "
-                f"[dim]Filtered[/dim]=[white]{len(apply_filter())}[/white]  "
-                f"[dim]Selected[/dim]=[white]{len(selected_ids)}[/white]  "
-                f"[dim]More[/dim]=[white]{'yes' if not exhausted else 'no'}[/white]\n"
-                f"[dim]Search[/dim]=[white]{query or '(all)'}[/white]",
-                border_style="bright_black",
-            )
-        )
-        filtered = apply_filter()
-        if not filtered:
-            console.print(_feedback("[warn]⚠[/warn] No matches. Change search."))
-            try:
-                query = _prompt("Search query (blank=all)", default="")
-            except CancelAction:
-                return
-            page = 0
-            continue
+        selected_ids: set[int] = set()
+        query = ""
+        page = 0
+
+        filter_cache: Optional[tuple[str, int, list[dict]]] = None
+
+        def apply_filter() -> list[dict]:
+            nonlocal filter_cache, corpus
+            if not query:
+                return dialogs
+            if (
+                filter_cache is not None
+                and filter_cache[0] == query
+                and filter_cache[1] == len(dialogs)
+            ):
+                return filter_cache[2]
+            if len(corpus) != search_end:
+                corpus = "".join(f"{line}\n" for line in search_lines)
+            q = query.lower()
+            out = []
+            pos = corpus.find(q)
+            while pos != -1:
+                idx = bisect_right(search_offsets, pos) - 1
+                out.append(dialogs[idx])
+                if idx + 1 >= len(search_offsets):
+                    break
+                pos = corpus.find(q, search_offsets[idx + 1])
+            filter_cache = (query, len(dialogs), out)
+            return out
+
+        # One Live frame for the whole picker on a terminal; commands redraw it
+        # in place instead of clearing and reprinting the screen.
+        live: Optional[Live] = None
+        if sys.stdin.isatty() and console.is_terminal:
+            live = Live(console=console, auto_refresh=False, screen=True)
+            live.start()
+        notice = ""
+        searching = False
+
+        def render_view(
+            view: tuple, filtered: list[dict], page_items: list[dict], typed: Optional[str]
+        ) -> RenderableType:
+            (
+                query_,
+                page_,
+                selected_count,
+                page_selected,
+                loaded,
+                exhausted_,
+                notice_,
+                label,
+            ) = view
+            total_pages = max(1, (len(filtered) + page_size - 1) // page_size)
+            start = page_ * page_size
+            parts: list[RenderableType] = [
+                Panel.fit(
+                    f"[bold]Import from Telegram[/bold]\n\n"
+                    f"[dim]Loaded[/dim]=[white]{loaded}[/white]  "
+                    f"[dim]Filtered[/dim]=[white]{len(filtered)}[/white]  "
+                    f"[dim]Selected[/dim]=[white]{selected_count}[/white]  "
+                    f"[dim]More[/dim]=[white]{'yes' if not exhausted_ else 'no'}[/white]\n"
+                    f"[dim]Search[/dim]=[white]{query_ or '(all)'}[/white]",
+                    border_style="bright_black",
+                )
+            ]
+            if filtered:
+                table = _new_dialog_table()
+                for i, (d, is_selected) in enumerate(
+                    zip(page_items, page_selected), start=1
+                ):
+                    table.add_row(
+                        str(i),
+                        "x" if is_selected else "",
+                        str(d.get("name", "")),
+                        f"@{d['username']}" if d.get("username") else "-",
+                        str(d["id"]),
+                        str(d.get("type", "")),
+                    )
+                parts.append(table)
+                parts.append(
+                    Panel.fit(
+                        "Commands:\n"
+                        "  - numbers (e.g. 1,3,5): toggle selection on this page\n"
+                        "  - n / p: next / previous page\n"
+                        "  - s: set search query\n"
+                        "  - c: clear selection\n"
+                        "  - i: import selected\n"
+                        "  - q: cancel\n",
+                        title=f"Page {page_ + 1}/{total_pages}  (showing {start + 1}-{start + len(page_items)})",
+                        border_style="bright_black",
+                    )
+                )
+            if notice_:
+                parts.append(_feedback(notice_))
+            if typed is not None:
+                parts.append(
+                    Text.from_markup(
+                        f"[key]{label}[/key]: [value]{escape(typed)}[/value]"
+                    )
+                )
+            return Group(*parts)
+
+        async def read_input(label: str, redraw: Callable[[str], RenderableType]) -> str:
+            if live is None:
+                # Off the event loop, so the dialog prefetch keeps running.
+                return await asyncio.to_thread(_prompt, label, "")
+            value = (await _read_line_live(live, redraw)).strip()
+            if value.lower() in {"q", "quit", "cancel"}:
+                raise CancelAction()
+            return value
+
+        # Screen contents as of the last redraw; commands that change none of
+        # it (blank input, bad input) leave the screen as it is.
+        drawn_view: Optional[tuple] = None
+        try:
+            while True:
+                loaded = len(dialogs)
+                filtered = apply_filter()
+                total_pages = max(1, (len(filtered) + page_size - 1) // page_size)
+                page = max(0, min(page, total_pages - 1))
+                start = page * page_size
+                end = min(start + page_size, len(filtered))
+                page_items = filtered[start:end]
+                page_selected = tuple(d["id"] in selected_ids for d in page_items)
+                if not filtered:
+                    notice = "[warn]⚠[/warn] No matches. Change search."
+                    searching = True
+                prompt_label = "Search query (blank=all)" if searching else "Import command"
+
+                # What is on screen: the header shows only the selection count
+                # and the table only this page's flags, so those cover selection.
+                view = (
+                    query,
+                    page,
+                    len(selected_ids),
+                    page_selected,
+                    loaded,
+                    exhausted,
+                    notice,
+                    prompt_label,
+                )
+                if view != drawn_view:
+                    drawn_view = view
+                    if live is not None:
+                        _update_live_frame(
+                            live, render_view(view, filtered, page_items, "")
+                        )
+                    else:
+                        with _synchronized_output():
+                            console.clear()
+                            console.print(render_view(view, filtered, page_items, None))
 
-        total_pages = max(1, (len(filtered) + page_size - 1) // page_size)
-        page = max(0, min(page, total_pages - 1))
-        start = page * page_size
-        end = min(start + page_size, len(filtered))
-        page_items = filtered[start:end]
+                def redraw(typed: str) -> RenderableType:
+                    return render_view(view, filtered, page_items, typed)
 
-        table = Table(
-            title="Telegram dialogs",
-            box=box.SIMPLE_HEAD,
-            show_edge=False,
-            expand=True,
-        )
-        table.add_column("#", style="key", no_wrap=True, width=4)
-        table.add_column("Sel", style="ok", no_wrap=True, width=3)
-        table.add_column("Name", style="heading", ratio=1, overflow="fold")
-        table.add_column("Username", style="dim", ratio=1, overflow="fold")
-        table.add_column("ID", style="value", overflow="ellipsis", max_width=18)
-        table.add_column("Type", style="dim", no_wrap=True)
-        for i, d in enumerate(page_items, start=1):
-            did = d["id"]
-            sel = "x" if did in selected_ids else ""
-            table.add_row(
-                str(i),
-                sel,
-                str(d.get("name", "")),
-                f"@{d['username']}" if d.get("username") else "-",
-                str(did),
-                str(d.get("type", "")),
-            )
-        console.print(table)
-        console.print(
-            Panel.fit(
-                "Commands:\n"
-                "  - numbers (e.g. 1,3,5): toggle selection on this page\n"
-                "  - n / p: next / previous page\n"
-                "  - s: set search query\n"
-                "  - c: clear selection\n"
-                "  - i: import selected\n"
-                "  - q: cancel\n",
-                title=f"Page {page + 1}/{total_pages}  (showing {start + 1}-{end})",
-                border_style="bright_black",
-            )
-        )
+                notice = ""
+                if searching:
+                    try:
+                        query = await read_input(prompt_label, redraw)
+                    except CancelAction:
+                        return
+                    searching = False
+                    page = 0
+                    continue
 
-        try:
-            cmd = _prompt("Import command", default="").strip()
-        except CancelAction:
-            return
+                try:
+                    cmd = await read_input(prompt_label, redraw)
+                except CancelAction:
+                    return
 
-        if cmd == "":
-            continue
-        low = cmd.lower()
-        if low in {"n", "next"}:
-            if page + 1 >= total_pages and not exhausted:
-                await fetch_more(len(dialogs) + batch_size)
-            page += 1
-            continue
-        if low in {"p", "prev", "previous"}:
-            page -= 1
-            continue
-        if low in {"s", "search"}:
-            try:
-                query = _prompt("Search query (blank=all)", default="")
-            except CancelAction:
-                return
-            page = 0
-            continue
-        if low in {"c", "clear"}:
-            selected_ids.clear()
-            continue
-        if low in {"i", "import"}:
-            if not selected_ids:
-                console.print(_feedback("[warn]⚠[/warn] Nothing selected."))
-                continue
-            break
+                if cmd == "":
+                    continue
+                low = cmd.lower()
+                if low in {"n", "next"}:
+                    if page + 1 >= total_pages and not exhausted:
+                        await fetch_more(len(dialogs) + batch_size)
+                    page += 1
+                    continue
+                if low in {"p", "prev", "previous"}:
+                    page -= 1
+                    continue
+                if low in {"s", "search"}:
+                    searching = True
+                    continue
+                if low in {"c", "clear"}:
+                    selected_ids.clear()
+                    continue
+                if low in {"i", "import"}:
+                    if not selected_ids:
+                        notice = "[warn]⚠[/warn] Nothing selected."
+                        continue
+                    break
 
-        # toggle selection on current page by index
-        parts = [p.strip() for p in cmd.split(",") if p.strip()]
-        try:
-            idxs = sorted({int(p) for p in parts})
-        except ValueError:
-            console.print(_feedback("[warn]⚠[/warn] Unknown command."))
-            continue
-        if not idxs or any(i < 1 or i > len(page_items) for i in idxs):
-            console.print(_feedback("[warn]⚠[/warn] Index out of range for this page."))
-            continue
-        for i in idxs:
-            did = page_items[i - 1]["id"]
-            if did in selected_ids:
-                selected_ids.remove(did)
-            else:
-                selected_ids.add(did)
+                # toggle selection on current page by index
+                try:
+                    idxs = _parse_index_list(cmd)
+                except ValueError:
+                    notice = "[warn]⚠[/warn] Unknown command."
+                    continue
+                if not idxs or any(i < 1 or i > len(page_items) for i in idxs):
+                    notice = "[warn]⚠[/warn] Index out of range for this page."
+                    continue
+                for i in idxs:
+                    did = page_items[i - 1]["id"]
+                    if did in selected_ids:
+                        selected_ids.remove(did)
+                    else:
+                        selected_ids.add(did)
+        finally:
+            if live is not None:
+                live.stop()
+    finally:
+        prefetch_task.cancel()
+        # Wait for the task to unwind so the dialog iterator is closed here,
+        # not left suspended for the garbage collector.
+        with suppress(asyncio.CancelledError):
+            await prefetch_task
 
     try:
         import_source_group = _prompt(
@@ -1039,12 +1350,7 @@ async def _send_test_message(ctx: TuiContext) -> None:
     table.add_column("Type", style="dim", no_wrap=True)
     table.add_column("Target", style="value", overflow="ellipsis", max_width=18)
     for i, row in enumerate(destinations, start=1):
-        table.add_row(
-            str(i),
-            str(row.get("destination_name") or f"dest-{row.get('destination_id')}"),
-            _destination_type_human(str(row.get("destination_type") or "")),
-            _destination_target_label(row),
-        )
+        table.add_row(str(i), *_destination_cells(row))
     console.print(table)
     try:
         dest_idx = _choose_index(
@@ -1138,11 +1444,7 @@ def _manage_channels(ctx: TuiContext) -> None:
     table.add_column("Status", no_wrap=True)
     membership_map = ctx.db.get_source_group_membership_map(active_only=False)
     for i, ch in enumerate(channels, start=1):
-        status = (
-            Text("✔ active", style="ok")
-            if ch.is_active
-            else Text("○ disabled", style="status.disabled")
-        )
+        status = _STATUS_ACTIVE if ch.is_active else _STATUS_DISABLED
         table.add_row(
             str(i),
             ch.name,
@@ -1242,11 +1544,7 @@ async def _manage_webhooks(ctx: TuiContext) -> None:
     table.add_column("Name", style="heading", ratio=1, overflow="fold")
     table.add_column("Status", no_wrap=True)
     for i, wh in enumerate(webhooks, start=1):
-        status = (
-            Text("✔ active", style="ok")
-            if wh.is_active
-            else Text("○ disabled", style="status.disabled")
-        )
+        status = _STATUS_ACTIVE if wh.is_active else _STATUS_DISABLED
         table.add_row(str(i), wh.name, status)
     console.print(table)
 
@@ -1310,6 +1608,38 @@ async def _manage_webhooks(ctx: TuiContext) -> None:
         return
 
 
+def _make_mapping_table(title: str, *, with_sel: bool = False) -> Table:
+    table = Table(
+        title=title,
+        box=box.SIMPLE_HEAD,
+        show_edge=False,
+        expand=True,
+    )
+    if with_sel:
+        table.add_column("Row", style="key", no_wrap=True, width=4)
+        table.add_column("Sel", style="ok", no_wrap=True, width=3)
+    else:
+        table.add_column("#", style="key", no_wrap=True, width=4)
+    table.add_column("Source channel", style="heading", ratio=1, overflow="fold")
+    table.add_column("Channel ID", style="value", overflow="ellipsis", max_width=18)
+    table.add_column("Status", no_wrap=True)
+    return table
+
+
+_MAPPING_COMMANDS_PANEL = Panel.fit(
+    "Commands:\n\n"
+    "  [key]a[/key]  add channel(s)\n"
+    "  [key]t[/key]  toggle mapping(s)\n"
+    "  [key]e[/key]  enable mapping(s)\n"
+    "  [key]x[/key]  disable mapping(s)\n"
+    "  [key]d[/key]  delete mapping(s)\n"
+    "  [key]m[/key]  move mapping(s) to another webhook\n"
+    "  [key]q[/key]  back\n",
+    title="Manage",
+    border_style="bright_black",
+)
+
+
 def _manage_mappings(ctx: TuiContext) -> None:
     channels = {c.id: c for c in ctx.db.get_telegram_channels(active_only=False)}
     webhooks = ctx.db.get_discord_webhooks(active_only=False)
@@ -1318,61 +1648,60 @@ def _manage_mappings(ctx: TuiContext) -> None:
         return
 
     def parse_rows(raw: str, max_rows: int) -> Optional[list[int]]:
-        try:
-            idxs = sorted({int(p.strip()) for p in raw.split(",") if p.strip()})
-        except ValueError:
-            return None
+        # One pass: validate, range-check and dedupe, bailing on the first bad part.
+        seen = bytearray(max_rows + 1)
+        idxs: list[int] = []
+        for part in raw.split(","):
+            part = part.strip()
+            if not part:
+                continue
+            try:
+                i = int(part)
+            except ValueError:
+                return None
+            if i < 1 or i > max_rows:
+                return None
+            if not seen[i]:
+                seen[i] = 1
+                idxs.append(i)
         if not idxs:
             return None
-        if any(i < 1 or i > max_rows for i in idxs):
-            return None
+        idxs.sort()
         return idxs
 
     def select_rows_dialog(title: str, grouped: list) -> list[int]:
         selected: set[int] = set()
-        while True:
-            console.clear()
-            table = Table(
-                title=title,
-                box=box.SIMPLE_HEAD,
-                show_edge=False,
-                expand=True,
-            )
-            table.add_column("Row", style="key", no_wrap=True, width=4)
-            table.add_column("Sel", style="ok", no_wrap=True, width=3)
-            table.add_column(
-                "Source channel", style="heading", ratio=1, overflow="fold"
-            )
-            table.add_column(
-                "Channel ID", style="value", overflow="ellipsis", max_width=18
+        # The table is built once; toggling only rewrites the touched Sel cells.
+        sel_cells = [Text() for _ in grouped]
+        table = _make_mapping_table(title, with_sel=True)
+        rows_data = [
+            (
+                str(i),
+                sel_cells[i - 1],
+                ch.name if ch else f"(channel db_id={m.channel_id})",
+                str(ch.channel_id) if ch else "-",
+                _STATUS_ACTIVE if m.is_active else _STATUS_DISABLED,
             )
-            table.add_column("Status", no_wrap=True)
-            for i, m in enumerate(grouped, start=1):
-                ch = channels.get(m.channel_id)
-                status = (
-                    Text("✔ active", style="ok")
-                    if m.is_active
-                    else Text("○ disabled", style="status.disabled")
-                )
-                table.add_row(
-                    str(i),
-                    "✓" if i in selected else "",
-                    ch.name if ch else f"(channel db_id={m.channel_id})",
-                    str(ch.channel_id) if ch else "-",
-                    status,
-                )
-            console.print(table)
-            console.print(
-                Panel.fit(
-                    "Selection:\n"
-                    "  - numbers (e.g. 1,3,5): toggle selection\n"
-                    "  - Enter               : continue\n"
-                    "  - c                   : clear selection\n"
-                    "  - q                   : back\n",
-                    title=f"Selected: {len(selected)}",
-                    border_style="bright_black",
+            for i, m in enumerate(grouped, start=1)
+            for ch in (channels.get(m.channel_id),)
+        ]
+        for r in rows_data:
+            table.add_row(*r)
+        while True:
+            with _synchronized_output():
+                console.clear()
+                _print_table(
+                    table,
+                    Panel.fit(
+                        "Selection:\n"
+                        "  - numbers (e.g. 1,3,5): toggle selection\n"
+                        "  - Enter               : continue\n"
+                        "  - c                   : clear selection\n"
+                        "  - q                   : back\n",
+                        title=f"Selected: {len(selected)}",
+                        border_style="bright_black",
+                    ),
                 )
-            )
             try:
                 cmd = _prompt("Select rows", default="").strip()
             except CancelAction:
@@ -1384,11 +1713,12 @@ def _manage_mappings(ctx: TuiContext) -> None:
                     continue
                 return sorted(selected)
             if low in {"c", "clear"}:
+                for i in selected:
+                    sel_cells[i - 1].plain = ""
                 selected.clear()
                 continue
-            parts = [p.strip() for p in cmd.split(",") if p.strip()]
             try:
-                idxs = sorted({int(p) for p in parts})
+                idxs = _parse_index_list(cmd)
             except ValueError:
                 console.print(_feedback("[warn]⚠[/warn] Use row numbers like: 1,2,5"))
                 continue
@@ -1398,16 +1728,18 @@ def _manage_mappings(ctx: TuiContext) -> None:
             for i in idxs:
                 if i in selected:
                     selected.remove(i)
+                    sel_cells[i - 1].plain = ""
                 else:
                     selected.add(i)
+                    sel_cells[i - 1].plain = "✓"
 
+    # Mapping counts are re-read only after this screen changed them.
+    mappings_dirty = True
+    counts: dict[int, int] = {}
     while True:
-        console.clear()
-        mappings = ctx.db.get_channel_mappings(active_only=False)
-
-        counts: dict[int, int] = {}
-        for m in mappings:
-            counts[m.webhook_id] = counts.get(m.webhook_id, 0) + 1
+        if mappings_dirty:
+            counts = ctx.db.get_mapping_counts_by_webhook()
+            mappings_dirty = False
 
         wh_table = Table(
             title="Manage mappings (webhook → channels)",
@@ -1420,18 +1752,16 @@ def _manage_mappings(ctx: TuiContext) -> None:
         wh_table.add_column("Mapped channels", style="value", no_wrap=True)
         wh_table.add_column("Status", no_wrap=True)
         for i, wh in enumerate(webhooks, start=1):
-            status = (
-                Text("✔ active", style="ok")
-                if wh.is_active
-                else Text("○ disabled", style="status.disabled")
-            )
+            status = _STATUS_ACTIVE if wh.is_active else _STATUS_DISABLED
             wh_table.add_row(
                 str(i),
                 wh.name,
                 str(counts.get(wh.id, 0)),
                 status,
             )
-        console.print(wh_table)
+        with _synchronized_output():
+            console.clear()
+            console.print(wh_table)
 
         try:
             wh_idx = _choose_index("Pick webhook (1..N, q=back)", len(webhooks))
@@ -1440,58 +1770,33 @@ def _manage_mappings(ctx: TuiContext) -> None:
         selected_webhook = webhooks[wh_idx - 1]
 
         # Webhook detail view
+        # The table is rebuilt only when the mappings are re-read.
+        grouped: Optional[list] = None
         while True:
-            console.clear()
-            mappings = ctx.db.get_channel_mappings(active_only=False)
-            grouped = [m for m in mappings if m.webhook_id == selected_webhook.id]
-
-            table = Table(
-                title=f"Channels → {selected_webhook.name}",
-                box=box.SIMPLE_HEAD,
-                show_edge=False,
-                expand=True,
-            )
-            table.add_column("#", style="key", no_wrap=True, width=4)
-            table.add_column(
-                "Source channel", style="heading", ratio=1, overflow="fold"
-            )
-            table.add_column(
-                "Channel ID", style="value", overflow="ellipsis", max_width=18
-            )
-            table.add_column("Status", no_wrap=True)
-            for i, m in enumerate(grouped, start=1):
-                ch = channels.get(m.channel_id)
-                status = (
-                    Text("✔ active", style="ok")
-                    if m.is_active
-                    else Text("○ disabled", style="status.disabled")
-                )
-                table.add_row(
-                    str(i),
-                    ch.name if ch else f"(channel db_id={m.channel_id})",
-                    str(ch.channel_id) if ch else "-",
-                    status,
-                )
-            console.print(table)
+            if grouped is None:
+                grouped = ctx.db.get_channel_mappings_for_webhook(selected_webhook.id)
+                table = _make_mapping_table(f"Channels → {selected_webhook.name}")
+                rows_data = [
+                    (
+                        str(i),
+                        ch.name if ch else f"(channel db_id={m.channel_id})",
+                        str(ch.channel_id) if ch else "-",
+                        _STATUS_ACTIVE if m.is_active else _STATUS_DISABLED,
+                    )
+                    for i, m in enumerate(grouped, start=1)
+                    for ch in (channels.get(m.channel_id),)
+                ]
+                for r in rows_data:
+                    table.add_row(*r)
+            below: list[RenderableType] = []
             if not grouped:
-                console.print(
+                below.append(
                     _feedback("[warn]⚠[/warn] No channels mapped yet. Use 'a' to add.")
                 )
-
-            console.print(
-                Panel.fit(
-                    "Commands:\n\n"
-                    "  [key]a[/key]  add channel(s)\n"
-                    "  [key]t[/key]  toggle mapping(s)\n"
-                    "  [key]e[/key]  enable mapping(s)\n"
-                    "  [key]x[/key]  disable mapping(s)\n"
-                    "  [key]d[/key]  delete mapping(s)\n"
-                    "  [key]m[/key]  move mapping(s) to another webhook\n"
-                    "  [key]q[/key]  back\n",
-                    title="Manage",
-                    border_style="bright_black",
-                )
-            )
+            below.append(_MAPPING_COMMANDS_PANEL)
+            with _synchronized_output():
+                console.clear()
+                _print_table(table, *below)
 
             try:
                 cmd = _prompt("Command", default="").strip()
@@ -1523,12 +1828,9 @@ def _manage_mappings(ctx: TuiContext) -> None:
                 action = "move"
 
             if action in {"a", "add"}:
-                mapped_channel_ids = {m.channel_id for m in grouped}
-                available = [
-                    c
-                    for c in ctx.db.get_telegram_channels(active_only=True)
-                    if c.id not in mapped_channel_ids
-                ]
+                available = ctx.db.get_unmapped_channels_for_webhook(
+                    selected_webhook.id
+                )
                 if not available:
                     console.print(
                         _feedback(
@@ -1575,17 +1877,11 @@ def _manage_mappings(ctx: TuiContext) -> None:
                     console.print(_feedback("[warn]⚠[/warn] Canceled."))
                     continue
 
-                existing_pairs = {(m.channel_id, m.webhook_id) for m in mappings}
-                created = 0
-                for ch in to_add:
-                    key = (ch.id, selected_webhook.id)
-                    if key in existing_pairs:
-                        continue
-                    ctx.db.add_channel_mapping(
-                        channel_db_id=ch.id,
-                        webhook_db_id=selected_webhook.id,
-                    )
-                    created += 1
+                created = ctx.db.add_channel_mappings_bulk(
+                    [(ch.id, selected_webhook.id) for ch in to_add]
+                )
+                grouped = None
+                mappings_dirty = True
                 console.print(_feedback(f"[ok]✔[/ok] Added {created} mapping(s)."))
                 continue
 
@@ -1615,18 +1911,26 @@ def _manage_mappings(ctx: TuiContext) -> None:
                 targets = [grouped[i - 1] for i in idxs]
 
                 if action == "toggle":
-                    for m in targets:
-                        ctx.db.toggle_channel_mapping(m.id, not m.is_active)
+                    ctx.db.set_channel_mappings_active(
+                        [m.id for m in targets if not m.is_active], True
+                    )
+                    ctx.db.set_channel_mappings_active(
+                        [m.id for m in targets if m.is_active], False
+                    )
+                    grouped = None
+                    mappings_dirty = True
                     console.print(_feedback("[ok]✔[/ok] Toggled."))
                     continue
                 if action == "enable":
-                    for m in targets:
-                        ctx.db.toggle_channel_mapping(m.id, True)
+                    ctx.db.set_channel_mappings_active([m.id for m in targets], True)
+                    grouped = None
+                    mappings_dirty = True
                     console.print(_feedback("[ok]✔[/ok] Enabled."))
                     continue
                 if action == "disable":
-                    for m in targets:
-                        ctx.db.toggle_channel_mapping(m.id, False)
+                    ctx.db.set_channel_mappings_active([m.id for m in targets], False)
+                    grouped = None
+                    mappings_dirty = True
                     console.print(_feedback("[ok]✔[/ok] Disabled."))
                     continue
                 if action == "delete":
@@ -1640,8 +1944,9 @@ def _manage_mappings(ctx: TuiContext) -> None:
                     if confirm != "delete":
                         console.print(_feedback("[warn]⚠[/warn] Canceled."))
                         continue
-                    for m in targets:
-                        ctx.db.delete_channel_mapping(m.id)
+                    ctx.db.delete_channel_mappings([m.id for m in targets])
+                    grouped = None
+                    mappings_dirty = True
                     console.print(_feedback("[ok]✔[/ok] Deleted."))
                     continue
 
@@ -1669,8 +1974,9 @@ def _manage_mappings(ctx: TuiContext) -> None:
                 except CancelAction:
                     continue
                 new_wh = active_webhooks[new_idx - 1]
-                for m in targets:
-                    ctx.db.update_channel_mapping_webhook(m.id, new_wh.id)
+                ctx.db.move_channel_mappings([m.id for m in targets], new_wh.id)
+                grouped = None
+                mappings_dirty = True
                 console.print(
                     _feedback(
                         f"[ok]✔[/ok] Moved {len(targets)} mapping(s) to '{new_wh.name}'."
@@ -1769,19 +2075,10 @@ def _create_mappings(ctx: TuiContext) -> None:
         console.print(_feedback("[warn]⚠[/warn] Canceled."))
         return
 
-    existing = {
-        (m.channel_id, m.webhook_id)
-        for m in ctx.db.get_channel_mappings(active_only=False)
-    }
-    created = 0
-    skipped = 0
-    for ch in selected_channels:
-        key = (ch.id, webhook.id)
-        if key in existing:
-            skipped += 1
-            continue
-        ctx.db.add_channel_mapping(channel_db_id=ch.id, webhook_db_id=webhook.id)
-        created += 1
+    created = ctx.db.add_channel_mappings_bulk(
+        [(ch.id, webhook.id) for ch in selected_channels]
+    )
+    skipped = len(selected_channels) - created
 
     console.print(
         _feedback(
@@ -1792,12 +2089,23 @@ def _create_mappings(ctx: TuiContext) -> None:
     )
 
 
-def _destination_type_human(destination_type: str) -> str:
-    if destination_type == DestinationType.DISCORD_WEBHOOK.value:
-        return "discord"
-    if destination_type == DestinationType.TELEGRAM_CHAT.value:
-        return "telegram"
-    return destination_type
+_DEST_TYPE_HUMAN = {
+    DestinationType.DISCORD_WEBHOOK.value: "discord",
+    DestinationType.TELEGRAM_CHAT.value: "telegram",
+}
+
+
+def _destination_type_human(destination_type: str) -> str:
+    return _DEST_TYPE_HUMAN.get(destination_type, destination_type)
+
+
+@lru_cache(maxsize=512)
+def _webhook_target_label(url: str) -> str:
+    # Every table redraw relabels the same few webhook URLs.
+    redacted = DiscordWebhookSender.redact_webhook_url(url)
+    if len(redacted) <= 32:
+        return redacted
+    return f"{redacted[:24]}..."
 
 
 def _destination_target_label(row: dict) -> str:
@@ -1806,10 +2114,7 @@ def _destination_target_label(row: dict) -> str:
         url = str(row.get("discord_webhook_url") or "")
         if not url:
             return "(missing webhook url)"
-        redacted = DiscordWebhookSender.redact_webhook_url(url)
-        if len(redacted) <= 32:
-            return redacted
-        return f"{redacted[:24]}..."
+        return _webhook_target_label(url)
 
     if destination_type == DestinationType.TELEGRAM_CHAT.value:
         chat_id = row.get("telegram_chat_id")
@@ -1821,16 +2126,19 @@ def _destination_target_label(row: dict) -> str:
     return "-"
 
 
-def _print_destinations_v2(ctx: TuiContext) -> None:
-    rows = ctx.db.get_destination_rows(active_only=False)
-    if not rows:
-        console.print(
-            _feedback("[warn]⚠[/warn] No destinations saved.", title="Destinations")
-        )
-        return
+def _destination_cells(row: dict) -> tuple[str, str, str]:
+    """Name, type and target cells for a destination row."""
+    destination_type = row["destination_type"] or ""
+    return (
+        str(row["destination_name"] or f"dest-{row['destination_id']}"),
+        _DEST_TYPE_HUMAN.get(destination_type, destination_type),
+        _destination_target_label(row),
+    )
 
+
+def _make_destinations_table(title: str, *, with_status: bool = True) -> Table:
     table = Table(
-        title="Destinations",
+        title=title,
         box=box.SIMPLE_HEAD,
         expand=True,
         show_edge=False,
@@ -1839,21 +2147,31 @@ def _print_destinations_v2(ctx: TuiContext) -> None:
     table.add_column("Name", style="heading", ratio=1, overflow="fold")
     table.add_column("Type", style="info", no_wrap=True)
     table.add_column("Target", style="value", overflow="ellipsis", max_width=18)
-    table.add_column("Status", no_wrap=True)
-    for i, row in enumerate(rows, start=1):
-        status = (
-            Text("✔ active", style="ok")
-            if row.get("is_active")
-            else Text("○ disabled", style="status.disabled")
+    if with_status:
+        table.add_column("Status", no_wrap=True)
+    return table
+
+
+def _print_destinations_v2(ctx: TuiContext) -> None:
+    rows = ctx.db.get_destination_rows(active_only=False)
+    if not rows:
+        console.print(
+            _feedback("[warn]⚠[/warn] No destinations saved.", title="Destinations")
         )
-        table.add_row(
+        return
+
+    table = _make_destinations_table("Destinations")
+    rows_data = [
+        (
             str(i),
-            str(row.get("destination_name") or f"dest-{row.get('destination_id')}"),
-            _destination_type_human(str(row.get("destination_type") or "")),
-            _destination_target_label(row),
-            status,
+            *_destination_cells(row),
+            _STATUS_ACTIVE if row["is_active"] else _STATUS_DISABLED,
         )
-    console.print(table)
+        for i, row in enumerate(rows, start=1)
+    ]
+    for r in rows_data:
+        table.add_row(*r)
+    _print_table(table)
 
 
 async def _add_destination_v2(ctx: TuiContext) -> None:
@@ -1914,31 +2232,18 @@ async def _manage_destinations_v2(ctx: TuiContext) -> None:
         console.print(_feedback("[warn]⚠[/warn] No destinations saved."))
         return
 
-    table = Table(
-        title="Manage destinations",
-        box=box.SIMPLE_HEAD,
-        expand=True,
-        show_edge=False,
-    )
-    table.add_column("#", style="key", no_wrap=True, width=4)
-    table.add_column("Name", style="heading", ratio=1, overflow="fold")
-    table.add_column("Type", style="info", no_wrap=True)
-    table.add_column("Target", style="value", overflow="ellipsis", max_width=18)
-    table.add_column("Status", no_wrap=True)
-    for i, row in enumerate(rows, start=1):
-        status = (
-            Text("✔ active", style="ok")
-            if row.get("is_active")
-            else Text("○ disabled", style="status.disabled")
-        )
-        table.add_row(
+    table = _make_destinations_table("Manage destinations")
+    rows_data = [
+        (
             str(i),
-            str(row.get("destination_name") or f"dest-{row.get('destination_id')}"),
-            _destination_type_human(str(row.get("destination_type") or "")),
-            _destination_target_label(row),
-            status,
+            *_destination_cells(row),
+            _STATUS_ACTIVE if row["is_active"] else _STATUS_DISABLED,
         )
-    console.print(table)
+        for i, row in enumerate(rows, start=1)
+    ]
+    for r in rows_data:
+        table.add_row(*r)
+    _print_table(table)
 
     try:
         idx = _choose_index("Select destination (1..N, q=back)", len(rows))
@@ -2084,24 +2389,14 @@ def _create_routes_v2(ctx: TuiContext) -> None:
         console.print(_feedback("[warn]???[/warn] Canceled."))
         return
 
-    dest_table = Table(
-        title="Destination",
-        box=box.SIMPLE_HEAD,
-        expand=True,
-        show_edge=False,
-    )
-    dest_table.add_column("#", style="key", no_wrap=True, width=4)
-    dest_table.add_column("Name", style="heading", ratio=1, overflow="fold")
-    dest_table.add_column("Type", style="info", no_wrap=True)
-    dest_table.add_column("Target", style="value", overflow="ellipsis", max_width=18)
-    for i, row in enumerate(destinations, start=1):
-        dest_table.add_row(
-            str(i),
-            str(row.get("destination_name") or f"dest-{row.get('destination_id')}"),
-            _destination_type_human(str(row.get("destination_type") or "")),
-            _destination_target_label(row),
-        )
-    console.print(dest_table)
+    dest_table = _make_destinations_table("Destination", with_status=False)
+    rows_data = [
+        (str(i), *_destination_cells(row))
+        for i, row in enumerate(destinations, start=1)
+    ]
+    for r in rows_data:
+        dest_table.add_row(*r)
+    _print_table(dest_table)
 
     try:
         dest_idx = _choose_index(
@@ -2125,8 +2420,8 @@ def _create_routes_v2(ctx: TuiContext) -> None:
         group_table.add_column("Key", style="key", no_wrap=True, width=4)
         group_table.add_column("Group", style="heading", ratio=1, overflow="fold")
         group_table.add_row("0", "(no group)")
-        for i, g in enumerate(groups, start=1):
-            group_table.add_row(str(i), g.name)
+        for r in [(str(i), g.name) for i, g in enumerate(groups, start=1)]:
+            group_table.add_row(*r)
         console.print(group_table)
 
         while True:
@@ -2163,35 +2458,27 @@ def _create_routes_v2(ctx: TuiContext) -> None:
         console.print(_feedback("[warn]⚠[/warn] Canceled."))
         return
 
-    existing_keys = {
-        (int(r["source_channel_db_id"]), int(r["destination_id"]), r.get("group_id"))
-        for r in ctx.db.get_route_rows(active_only=False)
-    }
+    # One read up front; the first route per key decides the upsert.
+    existing: dict[tuple[int, int, Optional[int]], dict] = {}
+    for r in ctx.db.get_route_rows(active_only=False):
+        existing.setdefault(
+            (int(r["source_channel_db_id"]), int(r["destination_id"]), r.get("group_id")),
+            r,
+        )
 
-    created = 0
-    reactivated = 0
+    # Upsert behavior: create missing routes and re-enable inactive ones,
+    # each as a single write.
+    new_keys: list[tuple[int, int, Optional[int]]] = []
+    reactivate_ids: list[int] = []
     for source in selected_sources:
         key = (source.id, destination_id, group_id)
-        if key in existing_keys:
-            # Upsert behavior: ensure it is active.
-            rows = [
-                r
-                for r in ctx.db.get_route_rows(active_only=False)
-                if int(r["source_channel_db_id"]) == source.id
-                and int(r["destination_id"]) == destination_id
-                and r.get("group_id") == group_id
-            ]
-            if rows and not rows[0].get("route_is_active"):
-                ctx.db.toggle_route_mapping(int(rows[0]["route_id"]), True)
-                reactivated += 1
-            continue
-        ctx.db.add_route_mapping(
-            source_channel_db_id=source.id,
-            destination_id=destination_id,
-            group_id=group_id,
-            is_active=True,
-        )
-        created += 1
+        row = existing.get(key)
+        if row is None:
+            new_keys.append(key)
+        elif not row.get("route_is_active"):
+            reactivate_ids.append(int(row["route_id"]))
+    created = ctx.db.add_route_mappings_bulk(new_keys)
+    reactivated = ctx.db.set_route_mappings_active(reactivate_ids, True)
 
     console.print(
         _feedback(
@@ -2202,345 +2489,15 @@ def _create_routes_v2(ctx: TuiContext) -> None:
     )
 
 
-def _manage_routes_v2(ctx: TuiContext) -> None:
-    route_rows = ctx.db.get_route_rows(active_only=False)
-    if not route_rows:
-        console.print(_feedback("[warn]⚠[/warn] No routes saved."))
-        return
-
-    channels = {c.id: c for c in ctx.db.get_telegram_channels(active_only=False)}
-    destinations = ctx.db.get_destination_rows(active_only=True)
-    groups = {g.id: g for g in ctx.db.get_forwarding_groups(active_only=False)}
-
-    route_table = Table(
-        title="Manage routes",
-        box=box.SIMPLE_HEAD,
-        expand=True,
-        show_edge=False,
-    )
-    route_table.add_column("#", style="key", no_wrap=True, width=4)
-    route_table.add_column("Source", style="heading", ratio=1, overflow="fold")
-    route_table.add_column("Destination", style="heading", ratio=1, overflow="fold")
-    route_table.add_column("Type", style="info", no_wrap=True)
-    route_table.add_column("Group", style="value", ratio=1, overflow="fold")
-    route_table.add_column("Status", no_wrap=True)
-    for i, r in enumerate(route_rows, start=1):
-        src = channels.get(int(r["source_channel_db_id"]))
-        group = groups.get(r.get("group_id")) if r.get("group_id") else None
-        status = (
-            Text("✔ active", style="ok")
-            if r.get("route_is_active")
-            else Text("○ disabled", style="status.disabled")
-        )
-        route_table.add_row(
-            str(i),
-            src.name if src else f"(source db_id={r['source_channel_db_id']})",
-            str(r.get("destination_name") or f"dest-{r.get('destination_id')}"),
-            _destination_type_human(str(r.get("destination_type") or "")),
-            group.name if group else "-",
-            status,
-        )
-    console.print(route_table)
-
-    try:
-        idx = _choose_index("Select route (1..N, q=back)", len(route_rows))
-    except CancelAction:
-        return
-    row = route_rows[idx - 1]
-    route_id = int(row["route_id"])
-
-    actions = Table(title=f"Route #{route_id}", box=box.SIMPLE_HEAD)
-    actions.add_column("Key", style="key", no_wrap=True)
-    actions.add_column("Action", style="heading")
-    actions.add_row("1", "Toggle active/disabled")
-    actions.add_row("2", "Change destination")
-    actions.add_row("3", "Change forwarding group")
-    actions.add_row("4", "Delete route")
-    actions.add_row("0", "Back")
-    console.print(actions)
-
-    try:
-        choice = _prompt("Action (0-4)", default="0")
-    except CancelAction:
-        return
-
-    if choice == "1":
-        ctx.db.toggle_route_mapping(route_id, not bool(row.get("route_is_active")))
-        console.print(_feedback("[ok]✔[/ok] Updated."))
-        return
-
-    if choice == "2":
-        destination_rows = ctx.db.get_destination_rows(active_only=True)
-        if not destination_rows:
-            console.print(_feedback("[warn]⚠[/warn] No active destinations available."))
-            return
-        table = Table(
-            title="Move route to destination",
-            box=box.SIMPLE_HEAD,
-            expand=True,
-            show_edge=False,
-        )
-        table.add_column("#", style="key", no_wrap=True, width=4)
-        table.add_column("Name", style="heading", ratio=1, overflow="fold")
-        table.add_column("Type", style="info", no_wrap=True)
-        table.add_column("Target", style="value", overflow="ellipsis", max_width=18)
-        for i, d in enumerate(destination_rows, start=1):
-            table.add_row(
-                str(i),
-                str(d.get("destination_name")),
-                _destination_type_human(str(d.get("destination_type") or "")),
-                _destination_target_label(d),
-            )
-        console.print(table)
-        try:
-            dest_idx = _choose_index(
-                "Destination (1..N, q=cancel)", len(destination_rows)
-            )
-        except CancelAction:
-            return
-        selected_destination = destination_rows[dest_idx - 1]
-        selected_destination_id = int(selected_destination["destination_id"])
-
-        duplicate = [
-            r
-            for r in route_rows
-            if int(r["source_channel_db_id"]) == int(row["source_channel_db_id"])
-            and int(r["destination_id"]) == selected_destination_id
-            and r.get("group_id") == row.get("group_id")
-            and int(r["route_id"]) != route_id
-        ]
-        if duplicate:
-            console.print(
-                _feedback(
-                    "[warn]⚠[/warn] A route with the same source/destination/group already exists."
-                )
-            )
-            return
-
-        ctx.db.update_route_mapping(
-            route_id,
-            destination_id=selected_destination_id,
-            group_id=row.get("group_id"),
-        )
-        console.print(_feedback("[ok]✔[/ok] Updated."))
-        return
-
-    if choice == "3":
-        active_groups = ctx.db.get_forwarding_groups(active_only=True)
-        pick_table = Table(
-            title="Select forwarding group",
-            box=box.SIMPLE_HEAD,
-            expand=True,
-            show_edge=False,
-        )
-        pick_table.add_column("Key", style="key", no_wrap=True, width=4)
-        pick_table.add_column("Group", style="heading", ratio=1, overflow="fold")
-        pick_table.add_row("0", "(no group)")
-        for i, g in enumerate(active_groups, start=1):
-            pick_table.add_row(str(i), g.name)
-        console.print(pick_table)
-
-        while True:
-            try:
-                raw = _prompt("Group key (0..N, q=cancel)", default="0")
-            except CancelAction:
-                return
-            try:
-                group_idx = int(raw)
-            except ValueError:
-                console.print(_feedback("[warn]⚠[/warn] Please enter a number."))
-                continue
-
-            if group_idx == 0:
-                new_group_id = None
-                break
-            if 1 <= group_idx <= len(active_groups):
-                new_group_id = active_groups[group_idx - 1].id
-                break
-            console.print(_feedback("[warn]⚠[/warn] Out of range."))
-
-        duplicate = [
-            r
-            for r in route_rows
-            if int(r["source_channel_db_id"]) == int(row["source_channel_db_id"])
-            and int(r["destination_id"]) == int(row["destination_id"])
-            and r.get("group_id") == new_group_id
-            and int(r["route_id"]) != route_id
-        ]
-        if duplicate:
-            console.print(
-                _feedback(
-                    "[warn]⚠[/warn] A route with the same source/destination/group already exists."
-                )
-            )
-            return
-
-        ctx.db.update_route_mapping(
-            route_id,
-            destination_id=int(row["destination_id"]),
-            group_id=new_group_id,
-        )
-        console.print(_feedback("[ok]✔[/ok] Updated."))
-        return
-
-    if choice == "4":
-        try:
-            confirm = _prompt("Type 'delete' to confirm", default="")
-        except CancelAction:
-            return
-        if confirm != "delete":
-            console.print(_feedback("[warn]⚠[/warn] Canceled."))
-            return
-        ctx.db.delete_route_mapping(route_id)
-        console.print(_feedback("[ok]✔[/ok] Deleted."))
-        return
-    if not destinations:
-        console.print(
-            _feedback("[warn]⚠[/warn] No active destinations. Add one first.")
-        )
-        return
-
-    channel_table = Table(
-        title="Source Telegram channels",
-        box=box.SIMPLE_HEAD,
-        show_edge=False,
-        expand=True,
-    )
-    channel_table.add_column("#", style="key", no_wrap=True, width=4)
-    channel_table.add_column("Name", style="heading", ratio=1, overflow="fold")
-    channel_table.add_column(
-        "Channel ID", style="value", overflow="ellipsis", max_width=18
-    )
-    for i, ch in enumerate(channels, start=1):
-        channel_table.add_row(str(i), ch.name, str(ch.channel_id))
-    console.print(channel_table)
-
-    try:
-        source_idxs = _choose_many_indexes(
-            "Select source channels (e.g. 1,2 | all | q=cancel)",
-            max_index=len(channels),
-        )
-    except CancelAction:
-        console.print(_feedback("[warn]⚠[/warn] Canceled."))
-        return
-    selected_sources = [channels[i - 1] for i in source_idxs]
-
-    dest_table = Table(
-        title="Destination",
-        box=box.SIMPLE_HEAD,
-        show_edge=False,
-        expand=True,
-    )
-    dest_table.add_column("#", style="key", no_wrap=True, width=4)
-    dest_table.add_column("Name", style="heading", ratio=1, overflow="fold")
-    dest_table.add_column("Type", style="dim", no_wrap=True)
-    dest_table.add_column("Target", style="value", overflow="ellipsis", max_width=18)
-    for i, row in enumerate(destinations, start=1):
-        dest_table.add_row(
-            str(i),
-            str(row.get("destination_name") or f"dest-{row.get('destination_id')}"),
-            _destination_type_human(str(row.get("destination_type") or "")),
-            _destination_target_label(row),
-        )
-    console.print(dest_table)
-
-    try:
-        dest_idx = _choose_index(
-            "Select destination (1..N, q=cancel)", len(destinations)
-        )
-    except CancelAction:
-        console.print(_feedback("[warn]⚠[/warn] Canceled."))
-        return
-    destination = destinations[dest_idx - 1]
-    destination_id = int(destination["destination_id"])
-
-    groups = ctx.db.get_forwarding_groups(active_only=True)
-    group_id: Optional[int] = None
-    if groups:
-        group_table = Table(
-            title="Optional forwarding group",
-            box=box.SIMPLE_HEAD,
-            show_edge=False,
-            expand=True,
-        )
-        group_table.add_column("Key", style="key", no_wrap=True, width=4)
-        group_table.add_column("Group", style="heading", ratio=1, overflow="fold")
-        group_table.add_row("0", "(no group)")
-        for i, g in enumerate(groups, start=1):
-            group_table.add_row(str(i), g.name)
-        console.print(group_table)
-
-        while True:
-            try:
-                raw = _prompt("Group key (0..N, default 0)", default="0")
-            except CancelAction:
-                console.print(_feedback("[warn]⚠[/warn] Canceled."))
-                return
-            try:
-                choice = int(raw)
-            except ValueError:
-                console.print(_feedback("[warn]⚠[/warn] Please enter a number."))
-                continue
-            if choice == 0:
-                group_id = None
-                break
-            if 1 <= choice <= len(groups):
-                group_id = groups[choice - 1].id
-                break
-            console.print(_feedback("[warn]⚠[/warn] Out of range."))
-
-    try:
-        confirm = (
-            _prompt(
-                f"Create routes from {len(selected_sources)} source(s) to '{destination.get('destination_name')}'? (y/n, default y)",
-                default="y",
-            ).lower()
-            or "y"
-        )
-    except CancelAction:
-        console.print(_feedback("[warn]⚠[/warn] Canceled."))
-        return
-    if confirm not in {"y", "yes"}:
-        console.print(_feedback("[warn]⚠[/warn] Canceled."))
-        return
-
-    existing_keys = {
-        (int(r["source_channel_db_id"]), int(r["destination_id"]), r.get("group_id"))
-        for r in ctx.db.get_route_rows(active_only=False)
-    }
-
-    created = 0
-    reactivated = 0
-    for source in selected_sources:
-        key = (source.id, destination_id, group_id)
-        if key in existing_keys:
-            # Upsert behavior: ensure it is active.
-            rows = [
-                r
-                for r in ctx.db.get_route_rows(active_only=False)
-                if int(r["source_channel_db_id"]) == source.id
-                and int(r["destination_id"]) == destination_id
-                and r.get("group_id") == group_id
-            ]
-            if rows and not rows[0].get("route_is_active"):
-                ctx.db.toggle_route_mapping(int(rows[0]["route_id"]), True)
-                reactivated += 1
-            continue
-        ctx.db.add_route_mapping(
-            source_channel_db_id=source.id,
-            destination_id=destination_id,
-            group_id=group_id,
-            is_active=True,
-        )
-        created += 1
-
-    console.print(
-        _feedback(
-            f"[ok]✔[/ok] Created [bold]{created}[/bold] route(s). "
-            f"Reactivated [bold]{reactivated}[/bold].",
-            title="Routes",
-        )
-    )
+def _route_ids_by_key(
+    route_rows: list[dict],
+) -> dict[tuple[int, int, Optional[int]], list[int]]:
+    """Map (source, destination, group) to the ids of routes using that key."""
+    out: dict[tuple[int, int, Optional[int]], list[int]] = {}
+    for r in route_rows:
+        key = (int(r["source_channel_db_id"]), int(r["destination_id"]), r.get("group_id"))
+        out.setdefault(key, []).append(int(r["route_id"]))
+    return out
 
 
 def _manage_routes_v2(ctx: TuiContext) -> None:
@@ -2548,6 +2505,7 @@ def _manage_routes_v2(ctx: TuiContext) -> None:
     if not route_rows:
         console.print(_feedback("[warn]⚠[/warn] No routes saved."))
         return
+    route_ids_by_key = _route_ids_by_key(route_rows)
 
     channels = {c.id: c for c in ctx.db.get_telegram_channels(active_only=False)}
     groups = {g.id: g for g in ctx.db.get_forwarding_groups(active_only=False)}
@@ -2565,8 +2523,12 @@ def _manage_routes_v2(ctx: TuiContext) -> None:
         filter_table.add_column("Source Group", style="heading", ratio=1, overflow="fold")
         filter_table.add_column("Sources", style="value", no_wrap=True)
         filter_table.add_row("0", "(all routes)", "-")
-        for i, (name, members) in enumerate(source_groups, start=1):
-            filter_table.add_row(str(i), name, str(len(members)))
+        rows_data = [
+            (str(i), name, str(len(members)))
+            for i, (name, members) in enumerate(source_groups, start=1)
+        ]
+        for r in rows_data:
+            filter_table.add_row(*r)
         console.print(filter_table)
 
         while True:
@@ -2619,24 +2581,23 @@ def _manage_routes_v2(ctx: TuiContext) -> None:
     route_table.add_column("Src Group", style="value", ratio=1, overflow="fold")
     route_table.add_column("Group", style="value", ratio=1, overflow="fold")
     route_table.add_column("Status", no_wrap=True)
-    for i, r in enumerate(route_rows, start=1):
-        src = channels.get(int(r["source_channel_db_id"]))
-        group = groups.get(r.get("group_id")) if r.get("group_id") else None
-        status = (
-            Text("✔ active", style="ok")
-            if r.get("route_is_active")
-            else Text("○ disabled", style="status.disabled")
-        )
-        route_table.add_row(
+    rows_data = [
+        (
             str(i),
             src.name if src else f"(source db_id={r['source_channel_db_id']})",
             str(r.get("destination_name") or f"dest-{r.get('destination_id')}"),
             _destination_type_human(str(r.get("destination_type") or "")),
             _channel_source_group_label(source_group_membership_map, src),
             group.name if group else "-",
-            status,
+            _STATUS_ACTIVE if r.get("route_is_active") else _STATUS_DISABLED,
         )
-    console.print(route_table)
+        for i, r in enumerate(route_rows, start=1)
+        for src in (channels.get(int(r["source_channel_db_id"])),)
+        for group in (groups.get(r.get("group_id")) if r.get("group_id") else None,)
+    ]
+    for row_data in rows_data:
+        route_table.add_row(*row_data)
+    _print_table(route_table)
 
     try:
         idx = _choose_index("Select route (1..N, q=back)", len(route_rows))
@@ -2680,13 +2641,12 @@ def _manage_routes_v2(ctx: TuiContext) -> None:
         table.add_column("Name", style="heading", ratio=1, overflow="fold")
         table.add_column("Type", style="dim", no_wrap=True)
         table.add_column("Target", style="value", overflow="ellipsis", max_width=18)
-        for i, d in enumerate(destination_rows, start=1):
-            table.add_row(
-                str(i),
-                str(d.get("destination_name")),
-                _destination_type_human(str(d.get("destination_type") or "")),
-                _destination_target_label(d),
-            )
+        rows_data = [
+            (str(i), *_destination_cells(d))
+            for i, d in enumerate(destination_rows, start=1)
+        ]
+        for r in rows_data:
+            table.add_row(*r)
         console.print(table)
         try:
             dest_idx = _choose_index(
@@ -2697,15 +2657,12 @@ def _manage_routes_v2(ctx: TuiContext) -> None:
         selected_destination = destination_rows[dest_idx - 1]
         selected_destination_id = int(selected_destination["destination_id"])
 
-        duplicate = [
-            r
-            for r in route_rows
-            if int(r["source_channel_db_id"]) == int(row["source_channel_db_id"])
-            and int(r["destination_id"]) == selected_destination_id
-            and r.get("group_id") == row.get("group_id")
-            and int(r["route_id"]) != route_id
-        ]
-        if duplicate:
+        key = (
+            int(row["source_channel_db_id"]),
+            selected_destination_id,
+            row.get("group_id"),
+        )
+        if any(rid != route_id for rid in route_ids_by_key.get(key, ())):
             console.print(
                 _feedback(
                     "[warn]⚠[/warn] A route with the same source/destination/group already exists."
@@ -2732,8 +2689,8 @@ def _manage_routes_v2(ctx: TuiContext) -> None:
         pick_table.add_column("Key", style="key", no_wrap=True, width=4)
         pick_table.add_column("Group", style="heading", ratio=1, overflow="fold")
         pick_table.add_row("0", "(no group)")
-        for i, g in enumerate(active_groups, start=1):
-            pick_table.add_row(str(i), g.name)
+        for r in [(str(i), g.name) for i, g in enumerate(active_groups, start=1)]:
+            pick_table.add_row(*r)
         console.print(pick_table)
 
         while True:
@@ -2755,15 +2712,12 @@ def _manage_routes_v2(ctx: TuiContext) -> None:
                 break
             console.print(_feedback("[warn]⚠[/warn] Out of range."))
 
-        duplicate = [
-            r
-            for r in route_rows
-            if int(r["source_channel_db_id"]) == int(row["source_channel_db_id"])
-            and int(r["destination_id"]) == int(row["destination_id"])
-            and r.get("group_id") == new_group_id
-            and int(r["route_id"]) != route_id
-        ]
-        if duplicate:
+        key = (
+            int(row["source_channel_db_id"]),
+            int(row["destination_id"]),
+            new_group_id,
+        )
+        if any(rid != route_id for rid in route_ids_by_key.get(key, ())):
             console.print(
                 _feedback(
                     "[warn]⚠[/warn] A route with the same source/destination/group already exists."
@@ -2899,13 +2853,17 @@ async def _test_forward_last_message(ctx: TuiContext) -> None:
     source_table.add_column(
         "Channel ID", style="value", overflow="ellipsis", max_width=18
     )
-    for i, ch in enumerate(channels, start=1):
-        source_table.add_row(
+    rows_data = [
+        (
             str(i),
             ch.name,
             f"@{ch.username}" if ch.username else "-",
             str(ch.channel_id),
         )
+        for i, ch in enumerate(channels, start=1)
+    ]
+    for r in rows_data:
+        source_table.add_row(*r)
     console.print(source_table)
 
     try:
@@ -3221,6 +3179,8 @@ def _mask_secret(value: Optional[str], keep_start: int = 8, keep_end: int = 6) -
 
 
 def _load_env_values(env_path: Path) -> dict[str, str]:
+    from dotenv import dotenv_values
+
     raw = dotenv_values(dotenv_path=env_path)
     out: dict[str, str] = {}
     for key, value in raw.items():
@@ -3230,6 +3190,8 @@ def _load_env_values(env_path: Path) -> dict[str, str]:
 
 
 def _set_env_value(env_path: Path, key: str, value: str) -> None:
+    from dotenv import set_key
+
     env_path.parent.mkdir(parents=True, exist_ok=True)
     if not env_path.exists():
         env_path.touch()
@@ -3237,6 +3199,8 @@ def _set_env_value(env_path: Path, key: str, value: str) -> None:
 
 
 def _unset_env_value(env_path: Path, key: str) -> None:
+    from dotenv import unset_key
+
     if env_path.exists():
         unset_key(str(env_path), key)
 
@@ -3612,26 +3576,33 @@ async def run_tui(config: Config, db: Database) -> None:
             right.add_row("18", "Manage source groups")
             right.add_row("0", "Exit")
 
-            def _render_home(typed: str = "") -> Panel:
-                header = _dashboard_header(
-                    config=config,
-                    app_version=app_version,
-                    sources_count=sources_count,
-                    destinations_count=destinations_count,
-                    routes_count=routes_count,
-                    session_source=session_source,
-                )
+            # Only the input line changes while typing; the header and menu
+            # depend on nothing but the terminal width, so build them once per width.
+            home_parts: dict[int, tuple[Panel, RenderableType]] = {}
 
+            def _render_home(typed: str = "") -> Panel:
                 terminal_width = _w()
-                if terminal_width >= 110:
-                    menu_content = Columns(
-                        [left, right],
-                        expand=False,
-                        equal=True,
-                        padding=(0, 3),
+                parts = home_parts.get(terminal_width)
+                if parts is None:
+                    header = _dashboard_header(
+                        config=config,
+                        app_version=app_version,
+                        sources_count=sources_count,
+                        destinations_count=destinations_count,
+                        routes_count=routes_count,
+                        session_source=session_source,
                     )
-                else:
-                    menu_content = Group(left, Text(""), right)
+                    if terminal_width >= 110:
+                        menu_content = Columns(
+                            [left, right],
+                            expand=False,
+                            equal=True,
+                            padding=(0, 3),
+                        )
+                    else:
+                        menu_content = Group(left, Text(""), right)
+                    parts = home_parts[terminal_width] = (header, menu_content)
+                header, menu_content = parts
 
                 input_hint = Text.from_markup(
                     f"[key]Select[/key] [dim](0-18, q=exit)[/dim]: [value]{typed}[/value]"
@@ -3702,6 +3673,11 @@ async def run_tui(config: Config, db: Database) -> None:
     except KeyboardInterrupt:
         console.print(_feedback("[info]●[/info] Exiting…"))
     finally:
+        if ctx.session_save_task is not None:
+            try:
+                await ctx.session_save_task
+            except Exception:
+                logger.exception("Failed to save the Telegram session string")
         try:
             await ctx.telegram_destination_sender.close()
         except Exception: